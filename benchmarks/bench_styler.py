@@ -0,0 +1,92 @@
+# Timings of the styler's hot paths against what they replaced. Run from the repository root
+# with `python benchmarks/bench_styler.py`; nothing next to the node is written.
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+scratch = tempfile.mkdtemp(prefix="sdxl_prompt_styler_bench_")
+os.environ["SDXL_PROMPT_STYLER_WATCH"] = "0"
+os.environ["SDXL_PROMPT_STYLER_CATALOG"] = os.path.join(scratch, "sdxl_styles.catalog")
+os.environ["SDXL_PROMPT_STYLER_CYCLE_STATE"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sdxl_prompt_styler as styler
+
+
+def report(label, statement, number):
+    seconds = min(timeit.repeat(statement, number=number, repeat=5)) / number
+    print(f"{label:<48} {seconds * 1e6:>12.2f} us")
+    return seconds
+
+
+def legacy_render(templates, template_name, positive_prompt, negative_prompt):
+    # The linear scan and str.replace of the original node
+    for template in templates:
+        if template.get('name') == template_name and 'prompt' in template:
+            positive = template['prompt'].replace('{prompt}', positive_prompt) or positive_prompt
+            negative = template.get('negative_prompt') or ""
+            return positive, negative.replace('{prompt}', negative_prompt) if negative_prompt and negative else negative
+
+
+def bench_render(catalog, names):
+    templates = []
+    for file_path in styler.list_style_files():
+        with open(file_path, 'r', encoding='utf8', errors='ignore') as file:
+            templates.extend(template for template in json.load(file) if isinstance(template, dict))
+    late = names[-1]
+    print("Rendering one style")
+    report("  linear scan + str.replace (last style)", lambda: legacy_render(templates, late, "a cat", "ugly"), 200)
+    report("  name index + compiled template", lambda: catalog.get(late).render("a cat", "ugly"), 100000)
+
+
+def bench_batch(catalog, names):
+    print("Styling 16 prompts with 32 styles")
+    prompts = [f"prompt {i}" for i in range(16)]
+    batch_names = names[:32]
+    report("  one render per pair", lambda: [styler.read_sdxl_templates_replace_and_combine(catalog, name, prompt, "")
+                                             for prompt in prompts for name in batch_names], 50)
+    report("  style_prompt_batch", lambda: styler.style_prompt_batch(catalog, batch_names, prompts, [""]), 50)
+
+
+def bench_search(catalog, names):
+    print("Searching style names for 'van gog'")
+    folded = [(styler.fold_style_name(name), name) for name in names]
+    report("  substring scan", lambda: [name for text, name in folded if "van gog" in text], 200)
+    catalog.name_index()
+    report("  trigram index", lambda: catalog.name_index().search("van gog", 20), 200)
+
+
+def bench_library(catalog, names):
+    print("Opening the styles and rendering one")
+    database_path = os.path.join(scratch, "sdxl_styles.sqlite")
+    styler.import_styles_to_sqlite(database_path)
+    late = names[-1]
+
+    def open_json():
+        styler.clear_catalog_cache()
+        styler.load_all_catalog().get(late).render("a cat", "")
+
+    def open_sqlite():
+        styler.clear_catalog_cache()
+        styler.load_style_catalog(database_path).get(late).render("a cat", "")
+
+    report("  JSON catalogs", open_json, 3)
+    report("  SQLite library", open_sqlite, 20)
+
+
+BENCHMARKS = (bench_render, bench_batch, bench_search, bench_library)
+
+
+def main():
+    catalog = styler.load_all_catalog()
+    names = list(catalog.selectable_names)
+    print(f"{len(names)} styles")
+    for benchmark in BENCHMARKS:
+        print()
+        benchmark(catalog, names)
+
+
+if __name__ == "__main__":
+    main()
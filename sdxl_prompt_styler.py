@@ -1,8 +1,25 @@
-from abc import ABC, abstractmethod
+import bisect
+import collections
+import ctypes
+import ctypes.util
+import fnmatch
+import functools
+import glob
+import hashlib
+import itertools
 import json
+import marshal
+import operator
 import os
 import random
-import time
+import re
+import select
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+import urllib.request
 
 def read_json_file(file_path):
     try:
@@ -12,7 +29,1314 @@ def read_json_file(file_path):
     except Exception as e:
         print(f"An error occurred: {str(e)}")
 
+def iter_json_array(file_path, chunk_size=1 << 16):
+    # Yield the elements of a top-level JSON array one at a time, holding at most the
+    # current element plus a chunk of text in memory
+    decoder = json.JSONDecoder()
+    whitespace = re.compile(r'\s*')
+
+    with open(file_path, 'r', encoding="utf8", errors='ignore') as file:
+        buffer = ''
+        position = 0
+        eof = False
+        state = 'start'  # then 'first', 'value' after a comma, 'separator' after a value
+        while True:
+            position = whitespace.match(buffer, position).end()
+            short = position == len(buffer) or (state in ('first', 'value') and len(buffer) - position < chunk_size)
+            if short and not eof:
+                # Drop the consumed text and top up the buffer
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            if position == len(buffer):
+                raise ValueError("Unexpected end of JSON data.")
+
+            char = buffer[position]
+            if state == 'start':
+                if char != '[':
+                    raise ValueError("Invalid JSON data. Expected a list of templates.")
+                state = 'first'
+                position += 1
+            elif state == 'separator':
+                if char == ']':
+                    return
+                if char != ',':
+                    raise ValueError(f"Expected ',' or ']' after array element in {file_path}.")
+                state = 'value'
+                position += 1
+            elif char == ']' and state == 'first':
+                return
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                    complete = end < len(buffer) or eof
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    complete = False
+                if not complete:
+                    # The element runs past the buffer, read as much again and retry
+                    chunk = file.read(max(chunk_size, len(buffer) - position))
+                    eof = not chunk
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+
+                yield item
+                position = end
+                state = 'separator'
+
+# Parsed style files shared by every node, keyed on the file's real path
+_catalog_cache = {}
+_catalog_cache_lock = threading.Lock()
+_catalog_cache_stats = {"hits": 0, "misses": 0, "loads": 0, "artifact_loads": 0, "reloads": 0}
+
+# With lazy catalogs the combo lists come from a name scan and the templates are
+# only parsed once a node executes. Set SDXL_PROMPT_STYLER_LAZY=0 to parse eagerly.
+LAZY_CATALOGS = os.environ.get("SDXL_PROMPT_STYLER_LAZY", "1") != "0"
+
+def file_fingerprint(file_path):
+    # Cheap stat-based version of a file, changes whenever the file is rewritten
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+def scan_style_names(file_path):
+    # Pull the style names out of a styles file without building the template dicts. The
+    # entries are decoded one at a time and only the "name" of each top-level object is
+    # kept, the same names the parser indexes.
+    try:
+        return [item['name'] for item in iter_json_array(file_path) if isinstance(item, dict) and 'name' in item]
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+        return None
+
+def load_style_catalog(file_path):
+    key = os.path.realpath(file_path)
+    try:
+        fingerprint = file_fingerprint(key)
+    except OSError as e:
+        print(f"An error occurred: {str(e)}")
+        _forget_style_catalog(key)
+        return None
+
+    with _catalog_cache_lock:
+        entry = _catalog_cache.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            _catalog_cache_stats["hits"] += 1
+            return entry[1]
+
+        _catalog_cache_stats["misses"] += 1
+
+    return _swap_in_catalog(key, fingerprint, entry)
+
+def _swap_in_catalog(key, fingerprint, entry):
+    # The new snapshot is built off to the side and published with a single assignment,
+    # so readers see either the old catalog or the complete new one
+    previous = entry[1] if entry is not None else None
+    catalog_class = SQLiteStyleCatalog if key.endswith(SQLITE_EXTENSIONS) else StyleCatalog
+    catalog = catalog_class(file_path=key, fingerprint=fingerprint)
+    if previous is not None and previous.loaded:
+        # Styles whose text did not change keep their compiled objects
+        catalog.load(previous=previous)
+        with _catalog_cache_lock:
+            _catalog_cache_stats["reloads"] += 1
+    elif not LAZY_CATALOGS:
+        catalog.load()
+
+    with _catalog_cache_lock:
+        current = _catalog_cache.get(key)
+        if current is not None and current is not entry and current[0] == fingerprint:
+            return current[1]
+        _catalog_cache[key] = (fingerprint, catalog)
+    return catalog
+
+def _forget_style_catalog(key):
+    with _catalog_cache_lock:
+        _catalog_cache.pop(key, None)
+
+def refresh_style_catalogs(directory=None):
+    # Reparse the cached catalogs whose files changed, an unchanged file costs one stat
+    with _catalog_cache_lock:
+        entries = list(_catalog_cache.items())
+
+    for key, entry in entries:
+        if directory is not None and os.path.dirname(key) != directory:
+            continue
+        try:
+            fingerprint = file_fingerprint(key)
+        except OSError:
+            _forget_style_catalog(key)
+            continue
+        if fingerprint != entry[0]:
+            _swap_in_catalog(key, fingerprint, entry)
+
+def get_catalog_cache_stats():
+    with _catalog_cache_lock:
+        return dict(_catalog_cache_stats, entries=len(_catalog_cache))
+
+def clear_catalog_cache():
+    with _catalog_cache_lock:
+        _catalog_cache.clear()
+        for counter in _catalog_cache_stats:
+            _catalog_cache_stats[counter] = 0
+
+STYLES_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# Compiled binary form of every sdxl_styles_*.json next to this file. It is built in the
+# background whenever a source file's content hash no longer matches the one stored in it.
+# Set SDXL_PROMPT_STYLER_CATALOG to another path to move it, or to 0 to always read the JSON.
+CATALOG_ARTIFACT_PATH = os.environ.get("SDXL_PROMPT_STYLER_CATALOG", os.path.join(STYLES_DIR, "sdxl_styles.catalog"))
+CATALOG_ARTIFACT_MAGIC = b"SDXLSTYLES\x01"
+CATALOG_ARTIFACT_FORMAT = 3
+# Byte length of the header, written right after the magic
+_artifact_header_length = struct.Struct('<Q')
+
+_catalog_artifact = None
+_catalog_artifact_lock = threading.Lock()
+# Background build started when the artifact is missing or out of date
+_catalog_artifact_build = None
+
+def list_style_files(directory=STYLES_DIR):
+    return sorted(glob.glob(os.path.join(directory, 'sdxl_styles_*.json')))
+
+def file_content_hash(file_path):
+    content_hash = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+# Catalog versions are this many hex digits of the content hash
+CATALOG_VERSION_LENGTH = 16
+
+def style_file_content_hash(file_path, fingerprint=None):
+    # The artifact already knows the hash of every styles file it was built from, so a file
+    # whose fingerprint still matches is not read again
+    payload = _catalog_artifact
+    if payload and fingerprint is not None and os.path.dirname(file_path) == STYLES_DIR:
+        source = payload["sources"].get(os.path.basename(file_path))
+        if source is not None and source[0] == fingerprint:
+            return source[1]
+    return file_content_hash(file_path)
+
+def pack_catalog_body(index):
+    # The templates of one styles file, with every string stored once and the styles
+    # referring to it by position
+    strings = []
+    string_ids = {}
+
+    def string_id(value):
+        string_index = string_ids.get(value)
+        if string_index is None:
+            string_index = string_ids[value] = len(strings)
+            strings.append(value)
+        return string_index
+
+    def pack_template(template):
+        return tuple(string_id(segment) for segment in template.segments)
+
+    records = tuple((string_id(style.name), pack_template(style.prompt), pack_template(style.negative_prompt))
+                    for style in index.values())
+    return marshal.dumps((tuple(strings), records))
+
+def build_catalog_artifact(artifact_path=None, directory=STYLES_DIR):
+    # The header holds the sources, the names of every catalog and where each catalog's
+    # templates sit in the file. Only the header is kept in memory; a catalog's templates
+    # are read from the file when the catalog is loaded.
+    global _catalog_artifact
+    artifact_path = artifact_path or CATALOG_ARTIFACT_PATH
+
+    sources = {}
+    names_by_file = {}
+    bodies = []
+    body_offsets = {}
+    offset = 0
+    for file_path in list_style_files(directory):
+        name = os.path.basename(file_path)
+        try:
+            fingerprint = file_fingerprint(file_path)
+            content_hash = file_content_hash(file_path)
+        except OSError as e:
+            print(f"An error occurred: {str(e)}")
+            continue
+        # A file that does not parse is still recorded, so the artifact stays current until
+        # the file changes; its catalog is read from the JSON as if there were no artifact
+        sources[name] = (fingerprint, content_hash)
+        try:
+            names, index = index_style_templates(iter_json_array(file_path))
+        except Exception as e:
+            print(f"An error occurred: {str(e)}")
+            continue
+
+        body = pack_catalog_body(index)
+        names_by_file[name] = tuple(names)
+        body_offsets[name] = (offset, len(body))
+        bodies.append(body)
+        offset += len(body)
+
+    content_hash = hashlib.sha256()
+    for name in sorted(sources):
+        content_hash.update(f"{name}:{sources[name][1]}\n".encode("utf8"))
+
+    payload = {
+        "format": CATALOG_ARTIFACT_FORMAT,
+        "content_hash": content_hash.hexdigest(),
+        "sources": sources,
+        "names": names_by_file,
+        "bodies": body_offsets,
+    }
+    header = marshal.dumps(payload)
+
+    # Each build writes its own temp file, so two threads or processes building at once
+    # never share one, and the last finished build replaces the artifact whole
+    temp_path = None
+    try:
+        descriptor, temp_path = tempfile.mkstemp(prefix=os.path.basename(artifact_path) + '.',
+                                                 suffix='.tmp', dir=os.path.dirname(artifact_path) or '.')
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(CATALOG_ARTIFACT_MAGIC)
+            file.write(_artifact_header_length.pack(len(header)))
+            file.write(header)
+            for body in bodies:
+                file.write(body)
+        os.replace(temp_path, artifact_path)
+        payload["path"] = artifact_path
+        payload["body_start"] = len(CATALOG_ARTIFACT_MAGIC) + _artifact_header_length.size + len(header)
+        payload["fingerprint"] = file_fingerprint(artifact_path)
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+        # The names are still good; the templates come from the JSON
+        payload["path"] = None
+
+    if directory == STYLES_DIR:
+        with _catalog_artifact_lock:
+            _catalog_artifact = payload
+    return payload
+
+def read_catalog_artifact(artifact_path=None):
+    artifact_path = artifact_path or CATALOG_ARTIFACT_PATH
+    try:
+        with open(artifact_path, 'rb') as file:
+            fingerprint = os.fstat(file.fileno())
+            if file.read(len(CATALOG_ARTIFACT_MAGIC)) != CATALOG_ARTIFACT_MAGIC:
+                return None
+            header_length, = _artifact_header_length.unpack(file.read(_artifact_header_length.size))
+            payload = marshal.loads(file.read(header_length))
+        if not isinstance(payload, dict) or payload.get("format") != CATALOG_ARTIFACT_FORMAT:
+            return None
+        payload["path"] = artifact_path
+        payload["body_start"] = len(CATALOG_ARTIFACT_MAGIC) + _artifact_header_length.size + header_length
+        payload["fingerprint"] = (fingerprint.st_mtime_ns, fingerprint.st_size, fingerprint.st_ino)
+        return payload
+    except (OSError, EOFError, ValueError, TypeError, struct.error):
+        return None
+
+def read_catalog_body(payload, name):
+    # Templates of one catalog, straight from the artifact file. None when the file was
+    # replaced since its header was read.
+    if payload.get("path") is None or name not in payload["bodies"]:
+        return None
+    offset, length = payload["bodies"][name]
+    try:
+        with open(payload["path"], 'rb') as file:
+            stat = os.fstat(file.fileno())
+            if (stat.st_mtime_ns, stat.st_size, stat.st_ino) != payload["fingerprint"]:
+                return None
+            file.seek(payload["body_start"] + offset)
+            return marshal.loads(file.read(length))
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+def _artifact_source_matches(payload, file_path):
+    source = payload["sources"].get(os.path.basename(file_path))
+    if source is None:
+        return False
+    try:
+        fingerprint = file_fingerprint(file_path)
+        if fingerprint == source[0]:
+            return True
+        # Touched or copied but possibly unchanged, fall back to comparing content
+        if file_content_hash(file_path) != source[1]:
+            return False
+    except OSError:
+        return False
+    payload["sources"][os.path.basename(file_path)] = (fingerprint, source[1])
+    return True
+
+def _artifact_is_current(payload, directory=STYLES_DIR):
+    files = list_style_files(directory)
+    if set(payload["sources"]) != {os.path.basename(file_path) for file_path in files}:
+        return False
+    return all(_artifact_source_matches(payload, file_path) for file_path in files)
+
+def _open_catalog_artifact():
+    global _catalog_artifact, _catalog_artifact_build
+    with _catalog_artifact_lock:
+        if _catalog_artifact is not None:
+            return _catalog_artifact
+        _catalog_artifact = False
+        if CATALOG_ARTIFACT_PATH == "0":
+            return False
+
+        payload = read_catalog_artifact()
+        if payload is not None and _artifact_is_current(payload):
+            _catalog_artifact = payload
+            return payload
+
+        # Names are scanned and templates parsed from the JSON until the build is done, so
+        # startup does not wait on it. A folder the artifact cannot be written to is left
+        # alone instead of being compiled again on every start.
+        artifact_dir = os.path.dirname(CATALOG_ARTIFACT_PATH) or '.'
+        if os.path.isdir(artifact_dir) and os.access(artifact_dir, os.W_OK):
+            _catalog_artifact_build = threading.Thread(target=build_catalog_artifact, daemon=True,
+                                                       name="sdxl_prompt_styler_catalog_build")
+            _catalog_artifact_build.start()
+        return False
+
+def _packed_catalog_entry(file_path):
+    if os.path.dirname(file_path) != STYLES_DIR:
+        return None, None
+    payload = _open_catalog_artifact()
+    if not payload:
+        return None, None
+    name = os.path.basename(file_path)
+    if name not in payload["names"] or not _artifact_source_matches(payload, file_path):
+        return None, None
+    return payload, name
+
+def read_packed_names(file_path):
+    payload, name = _packed_catalog_entry(file_path)
+    if payload is None:
+        return None
+    return list(payload["names"][name])
+
+def read_packed_catalog(file_path):
+    payload, name = _packed_catalog_entry(file_path)
+    if payload is None:
+        return None
+    body = read_catalog_body(payload, name)
+    if body is None:
+        return None
+
+    strings, records = body
+    string_at = strings.__getitem__
+    pool = {}
+    index = {}
+    for name_id, prompt_segments, negative_segments in records:
+        style_name = strings[name_id]
+        index[style_name] = CompiledStyle(
+            style_name,
+            pooled_template(tuple(map(string_at, prompt_segments)), pool),
+            pooled_template(tuple(map(string_at, negative_segments)), pool),
+        )
+    return list(payload["names"][name]), index
+
+class CompiledTemplate:
+    # A template split at its {prompt} placeholders once, so rendering is a single join.
+    __slots__ = ('segments', 'has_placeholder')
+
+    def __init__(self, segments):
+        self.segments = segments
+        self.has_placeholder = len(segments) > 1
+
+    @property
+    def source(self):
+        return '{prompt}'.join(self.segments) if self.has_placeholder else self.segments[0]
+
+    def render(self, text):
+        # Same result as source.replace('{prompt}', text), falling back to text for an empty template
+        if self.has_placeholder:
+            return text.join(self.segments)
+        return self.segments[0] or text
+
+def compile_template(source, pool=None):
+    segments = tuple(source.split('{prompt}'))
+    if pool is None:
+        return CompiledTemplate(segments)
+    return pooled_template(tuple([pool.setdefault(segment, segment) for segment in segments]), pool)
+
+def pooled_template(segments, pool):
+    # Styles of one load that share a negative prompt or a quality suffix share one
+    # compiled template, and equal fragments share one string
+    template = pool.get(segments)
+    if template is None:
+        template = pool[segments] = CompiledTemplate(segments)
+    return template
+
+class CompiledStyle:
+    __slots__ = ('name', 'prompt', 'negative_prompt')
+
+    def __init__(self, name, prompt, negative_prompt):
+        self.name = sys.intern(name) if type(name) is str else name
+        self.prompt = prompt
+        self.negative_prompt = negative_prompt
+
+    @classmethod
+    def from_template(cls, template, pool=None):
+        return cls(
+            template['name'],
+            compile_template(template['prompt'], pool),
+            compile_template(template_negative_prompt(template), pool),
+        )
+
+    def render(self, positive_prompt, negative_prompt):
+        positive_prompt = self.prompt.render(positive_prompt)
+        if negative_prompt:
+            negative_prompt = self.negative_prompt.render(negative_prompt)
+        else:
+            negative_prompt = self.negative_prompt.source
+        return positive_prompt, negative_prompt
+
+def compose_templates(outer, inner):
+    # A template that renders like outer.render(inner.render(text))
+    if not inner.has_placeholder:
+        if not inner.segments[0]:
+            return outer  # An empty template passes the text through
+        return CompiledTemplate((outer.render(inner.segments[0]),))
+    if not outer.has_placeholder:
+        return outer if outer.segments[0] else inner
+
+    # Splice the inner template into every placeholder of the outer one
+    segments = [outer.segments[0]]
+    for outer_segment in outer.segments[1:]:
+        segments[-1] += inner.segments[0]
+        segments.extend(inner.segments[1:])
+        segments[-1] += outer_segment
+    return CompiledTemplate(tuple(segments))
+
+@functools.lru_cache(maxsize=256)
+def compose_styles(styles):
+    # One compiled style equivalent to applying the given styles in order, each wrapping the
+    # result of the previous one like chained styler nodes. Cached per combination of styles.
+    composed = styles[0]
+    for style in styles[1:]:
+        composed = CompiledStyle(
+            f"{composed.name} + {style.name}",
+            compose_templates(style.prompt, composed.prompt),
+            compose_templates(style.negative_prompt, composed.negative_prompt),
+        )
+    return composed
+
+class StyleCatalog:
+    # Compiled styles of one styles file, indexed by name. A catalog opened from a file only
+    # reads the style names until something asks for the templates, and prefers the compiled
+    # catalog artifact over parsing the JSON when the artifact is current.
+
+    def __init__(self, templates=None, file_path=None, fingerprint=None):
+        self.file_path = file_path
+        # Stat fingerprint of the file this snapshot was loaded from
+        self.fingerprint = fingerprint
+        self._version = None
+        self._templates = templates
+        self._names = None
+        self._index = None
+        self._selectable_names = None
+        self._samplers = {}
+        self._name_index = None
+        self._text_index = None
+        self._previous_text_index = None
+        self._tag_index = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._index is not None
+
+    def load(self, previous=None):
+        with self._load_lock:
+            if self._index is None:
+                index = None
+                if self._templates is None and self.file_path is not None:
+                    packed = read_packed_catalog(self.file_path)
+                    if packed is not None:
+                        names, index = packed
+                        if self._names is None:
+                            self._names = names
+                        with _catalog_cache_lock:
+                            _catalog_cache_stats["artifact_loads"] += 1
+
+                if index is None:
+                    previous_index = previous._index if previous is not None else None
+                    if previous is not None:
+                        # Lets the text index keep the tokens of the styles that did not change
+                        self._previous_text_index = previous._text_index
+                    if self._templates is not None:
+                        names, index = index_style_templates(self._templates, previous_index)
+                    else:
+                        # Stream the entries straight into the index instead of building the list of dicts
+                        try:
+                            names, index = index_style_templates(iter_json_array(self.file_path), previous_index)
+                        except Exception as e:
+                            print(f"An error occurred: {str(e)}")
+                            names, index = [], {}
+                        with _catalog_cache_lock:
+                            _catalog_cache_stats["loads"] += 1
+
+                    if self._names is None:
+                        self._names = names
+
+                # The compiled styles replace the template dicts from here on
+                self._templates = None
+                self._index = index
+                # Names that resolve to a template, in file order, for random selection
+                self._selectable_names = tuple(index)
+        return self
+
+    @property
+    def index(self):
+        return self.load()._index
+
+    @property
+    def version(self):
+        # Content hash of the catalog, worked out once per snapshot. It only changes when the
+        # styles do, and is what IS_CHANGED, the render cache and the route ETags compare.
+        if self._version is None:
+            self._version = self.content_hash()[:CATALOG_VERSION_LENGTH]
+        return self._version
+
+    def content_hash(self):
+        if self.file_path is not None:
+            try:
+                return style_file_content_hash(self.file_path, self.fingerprint)
+            except OSError as e:
+                print(f"An error occurred: {str(e)}")
+        # Catalogs built from template dicts hash their compiled styles
+        content_hash = hashlib.sha256()
+        for name, style in self.index.items():
+            content_hash.update(repr((name, style.prompt.segments, style.negative_prompt.segments)).encode('utf-8', 'surrogatepass'))
+        return content_hash.hexdigest()
+
+    @property
+    def selectable_names(self):
+        return self.load()._selectable_names
+
+    @property
+    def names(self):
+        if self._names is None:
+            if self._templates is not None:
+                self._names = read_sdxl_styles(self._templates)
+            elif self.file_path is not None and not self.loaded:
+                names = read_packed_names(self.file_path)
+                self._names = names if names is not None else scan_style_names(self.file_path)
+            else:
+                self.load()
+        return self._names
+
+    def __len__(self):
+        return len(self.names or ())
+
+    def get(self, template_name):
+        return self.index.get(template_name)
+
+    def has_style(self, template_name):
+        # Also true for listed names without a usable template, which the combo lists show
+        return self.get(template_name) is not None or template_name in (self.names or ())
+
+    def name_page(self, offset, limit):
+        return (self.names or [])[offset:offset + limit]
+
+    def sampler(self, weighting="uniform", weights_file=None, style_filter="", tag_filter=""):
+        # Samplers are built once per catalog snapshot (and weights file version and filters)
+        # and reused by every random selection until the catalog is reloaded
+        style_filter = (style_filter or "").strip()
+        tag_filter = (tag_filter or "").strip()
+        if weighting == "weights file":
+            weights_path = resolve_weights_file(weights_file)
+            try:
+                key = (weighting, style_filter, tag_filter, weights_path, file_fingerprint(weights_path))
+            except OSError:
+                print(f"Error: Weights file {weights_path} not found, selecting uniformly.")
+                weighting, key = "uniform", ("uniform", style_filter, tag_filter)
+        else:
+            key = (weighting, style_filter, tag_filter)
+        if tag_filter:
+            # The tag index also changes with the tag keywords file
+            key += (load_tag_keywords()[0],)
+        sampler = self._samplers.get(key)
+        if sampler is None:
+            names = self.selectable_names
+            weights = style_weights(self, weighting, weights_file)
+            if style_filter or tag_filter:
+                # Styles the filters do not match get weight 0
+                try:
+                    bits = -1
+                    if style_filter:
+                        bits &= self.text_index().match(style_filter)
+                    if tag_filter:
+                        bits &= self.tag_index().match(tag_filter)
+                    matched = set(bitset_positions(bits))
+                except ValueError as e:
+                    print(f"Error: {str(e)}")
+                    matched = set()
+                # Only the matched styles go into the sampler, so neither weighting nor the
+                # uniform fallback for all-zero weights can reach past the filters. Nothing
+                # matched gives an empty sampler, whose draws are None.
+                positions = sorted(matched)
+                names = tuple(names[i] for i in positions)
+                if weights is not None:
+                    weights = [weights[i] for i in positions]
+            if not names or weights is None:
+                sampler = UniformSampler(names)
+            else:
+                sampler = AliasTable(names, weights)
+            if len(self._samplers) >= 64:
+                self._samplers.clear()
+            self._samplers[key] = sampler
+        return sampler
+
+    def check_filters(self, style_filter="", tag_filter=""):
+        # Raises ValueError for a malformed filter, only parsing it without building an index
+        evaluate_boolean_query(style_filter, lambda term: 0, 0)
+        evaluate_boolean_query(tag_filter, lambda term: 0, 0)
+
+    def name_index(self):
+        # Built on the first search and kept for the lifetime of this catalog snapshot
+        if self._name_index is None:
+            self._name_index = StyleNameIndex(self.names or ())
+        return self._name_index
+
+    def text_index(self):
+        # Built on the first text query, reusing the tokens of the previous snapshot's styles
+        if self._text_index is None:
+            previous = (self._previous_text_index,) if self._previous_text_index is not None else ()
+            self._text_index = StyleTextIndex(self.selectable_names, self.index, previous)
+            self._previous_text_index = None
+        return self._text_index
+
+    def tag_index(self):
+        # Rebuilt when the catalog reloads or the tag keywords file changes
+        keywords_version, keyword_tags = load_tag_keywords()
+        if self._tag_index is None or self._tag_index[0] != keywords_version:
+            self._tag_index = (keywords_version, StyleTagIndex(self.selectable_names, self.style_tags(keyword_tags)))
+        return self._tag_index[1]
+
+    def style_tags(self, keyword_tags):
+        # Tags of every selectable style: those declared in the file, the file's category and
+        # the tags whose keywords appear in the positive template
+        category = style_file_category(self.file_path) if self.file_path else None
+        declared = read_declared_tags(self.file_path) if self.file_path else {}
+        tokens = self.text_index().tokens
+        style_tags = {}
+        for name in self.selectable_names:
+            tags = set(declared.get(name, ()))
+            if category:
+                tags.add(category)
+            for token in tokens[name][1]:
+                tags.update(keyword_tags.get(token, ()))
+            style_tags[name] = tags
+        return style_tags
+
+class UnionStyleCatalog(StyleCatalog):
+    # Read-only view over several catalogs. The compiled styles are shared with the member
+    # catalogs, and a name listed by more than one member resolves to its first occurrence.
+
+    def __init__(self, catalogs):
+        super().__init__()
+        self.catalogs = tuple(catalogs)
+
+    def load(self):
+        with self._load_lock:
+            if self._index is None:
+                index = {}
+                for catalog in self.catalogs:
+                    for name, style in catalog.index.items():
+                        index.setdefault(name, style)
+                self._index = index
+                self._selectable_names = tuple(index)
+        return self
+
+    @property
+    def names(self):
+        if self._names is None:
+            self._names = list(dict.fromkeys(name for catalog in self.catalogs for name in (catalog.names or ())))
+        return self._names
+
+    def text_index(self):
+        # Assembled from the member indexes, so only the members that reloaded tokenize again
+        if self._text_index is None:
+            members = tuple(catalog.text_index() for catalog in self.catalogs)
+            self._text_index = StyleTextIndex(self.selectable_names, self.index, members)
+        return self._text_index
+
+    def content_hash(self):
+        content_hash = hashlib.sha256()
+        for catalog in self.catalogs:
+            content_hash.update(f"{os.path.basename(catalog.file_path or '')}:{catalog.version}\n".encode('utf8'))
+        return content_hash.hexdigest()
+
+    def style_tags(self, keyword_tags):
+        # A style listed by several categories carries the tags of the member it resolves to,
+        # the first one, so the tags always describe the template that gets rendered
+        style_tags = {}
+        for catalog in self.catalogs:
+            for name, tags in catalog.tag_index().tags.items():
+                style_tags.setdefault(name, tags)
+        return style_tags
+
+class UniformSampler:
+    # Uniform choice over a fixed name array
+    __slots__ = ('names', 'pool')
+
+    def __init__(self, names):
+        self.names = names
+        # Names a cycle walks through, here every one of them
+        self.pool = names
+
+    def sample(self, rng):
+        if not self.names:
+            return None
+        return self.names[rng.randrange(len(self.names))]
+
+class AliasTable:
+    # Vose's alias method: O(n) to build, then every weighted draw is one uniform index and
+    # one coin flip
+    __slots__ = ('names', 'probabilities', 'aliases', 'pool')
+
+    def __init__(self, names, weights):
+        count = len(names)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            # Nothing has a positive weight, fall back to a uniform choice
+            weights, total = [1.0] * count, float(count)
+
+        scaled = [weight * count / total for weight in weights] if count else []
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        probabilities = [1.0] * count
+        aliases = list(range(count))
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        self.names = names
+        self.probabilities = tuple(probabilities)
+        self.aliases = tuple(aliases)
+        # A cycle visits each name that can be drawn at all once, whatever its weight
+        self.pool = tuple(name for name, weight in zip(names, weights) if weight > 0)
+
+    def sample(self, rng):
+        if not self.names:
+            return None
+        i = rng.randrange(len(self.names))
+        if rng.random() < self.probabilities[i]:
+            return self.names[i]
+        return self.names[self.aliases[i]]
+
+class StylePermutation:
+    # Keyed bijection on range(size): a four round Feistel network over the smallest even bit
+    # width that covers size, cycle walking past the indices that fall outside. Any position
+    # of the shuffle is computed on its own in O(1) expected time, nothing is materialized.
+    __slots__ = ('size', 'half_bits', 'mask', 'keys')
+
+    def __init__(self, size, key):
+        bits = max(2, (size - 1).bit_length())
+        bits += bits & 1
+        self.size = size
+        self.half_bits = bits // 2
+        self.mask = (1 << self.half_bits) - 1
+        self.keys = tuple(
+            int.from_bytes(hashlib.blake2b(repr((key, round_number)).encode(), digest_size=8).digest(), 'little')
+            for round_number in range(4)
+        )
+
+    def _round(self, value, key):
+        value = ((value + key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        value ^= value >> 31
+        value = (value * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+        return (value ^ (value >> 29)) & self.mask
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, position):
+        if not 0 <= position < self.size:
+            raise IndexError(position)
+        value = position
+        while True:
+            left, right = value >> self.half_bits, value & self.mask
+            for key in self.keys:
+                left, right = right, left ^ self._round(right, key)
+            value = (left << self.half_bits) | right
+            if value < self.size:
+                return value
+
+@functools.lru_cache(maxsize=64)
+def style_permutation(size, seed, cycle):
+    return StylePermutation(size, (seed, cycle))
+
+# Cycle cursors survive restarts in this file. Set SDXL_PROMPT_STYLER_CYCLE_STATE to another
+# path to move it, or to 0 to keep the cursors in memory only.
+CYCLE_STATE_PATH = os.environ.get("SDXL_PROMPT_STYLER_CYCLE_STATE", os.path.join(STYLES_DIR, "sdxl_prompt_styler_cycles.json"))
+
+class StyleCycle:
+    # Shuffle bag over a pool of names: every name comes up exactly once per cycle, in an
+    # order fixed by the seed and the cycle number. The whole state of a bag is its cursor,
+    # [cycle, position, seed]. The seed is taken when a cycle starts, so a seed widget that
+    # changes on every queue item does not open a new deck each time. Only the most recently
+    # used MAX_CYCLES cursors are kept.
+    MAX_CYCLES = 256
+
+    def __init__(self, state_path=None):
+        self.state_path = state_path if state_path != "0" else None
+        self._cursors = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._cursors is None:
+            cursors = {}
+            if self.state_path is not None and os.path.exists(self.state_path):
+                state = read_json_file(self.state_path)
+                if isinstance(state, dict):
+                    cursors = state
+            self._cursors = cursors
+        return self._cursors
+
+    def _save(self):
+        if self.state_path is None:
+            return
+        temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding="utf8") as file:
+                json.dump(self._cursors, file)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            print(f"An error occurred: {str(e)}")
+
+    def cursor(self, key):
+        with self._lock:
+            cursor = self._load().get(key)
+            return tuple(cursor) if cursor else (0, 0)
+
+    def draw(self, key, seed, pool):
+        if not pool:
+            return None
+        with self._lock:
+            cursors = self._load()
+            cursor = cursors.pop(key, None) or [0, 0]
+            cycle, position = cursor[0], cursor[1]
+            # Cursors saved before the seed was recorded take the current one
+            cycle_seed = cursor[2] if len(cursor) > 2 else seed
+            if position >= len(pool):
+                cycle, position, cycle_seed = cycle + 1, 0, seed
+            elif position == 0:
+                cycle_seed = seed
+            name = pool[style_permutation(len(pool), cycle_seed, cycle)[position]]
+            # Reinserted last, so the first key is always the least recently used one
+            cursors[key] = [cycle, position + 1, cycle_seed]
+            while len(cursors) > self.MAX_CYCLES:
+                del cursors[next(iter(cursors))]
+            self._save()
+        return name
+
+    def reset(self, key=None):
+        with self._lock:
+            cursors = self._load()
+            if key is None:
+                cursors.clear()
+            else:
+                cursors.pop(key, None)
+            self._save()
+
+style_cycle = StyleCycle(CYCLE_STATE_PATH)
+
+SELECTION_MODES = ["random", "cycle"]
+SAMPLER_WEIGHTINGS = ["uniform", "by category", "weights file"]
+# Not named sdxl_styles_*.json, so it is never mistaken for a styles file
+DEFAULT_WEIGHTS_FILE = 'sdxl_prompt_styler_weights.json'
+
+def resolve_weights_file(weights_file):
+    # Relative paths are looked up next to the styles files
+    return os.path.join(STYLES_DIR, weights_file or DEFAULT_WEIGHTS_FILE)
+
+def style_weights(catalog, weighting, weights_file=None):
+    # Weight of every selectable name, in selectable_names order, or None for a uniform choice
+    names = catalog.selectable_names
+    if weighting == "by category":
+        if isinstance(catalog, SQLiteStyleCatalog):
+            return catalog.category_weights()
+        if not isinstance(catalog, UnionStyleCatalog):
+            return None
+        # Every category is equally likely however many styles it holds, a name listed by
+        # several categories belongs to the first one, as in the union index
+        owned = {}
+        for member in catalog.catalogs:
+            member_names = [name for name in member.selectable_names if name not in owned]
+            for name in member_names:
+                owned[name] = 1.0 / len(member_names)
+        return [owned.get(name, 0.0) for name in names]
+
+    if weighting == "weights file":
+        # A JSON object of style name to weight, styles it does not list keep weight 1
+        weights = read_json_file(resolve_weights_file(weights_file))
+        if not isinstance(weights, dict):
+            print(f"Error: Weights file {weights_file} must contain a JSON object of style weights.")
+            return None
+        result = []
+        for name in names:
+            weight = weights.get(name, 1.0)
+            result.append(float(weight) if isinstance(weight, (int, float)) and weight > 0 else 0.0)
+        return result
+
+    return None
+
+# Styles that belong to no category go into this optional file, listed last in the "all"
+# catalog. The category files it is made of come from STYLE_CATEGORIES.
+ALL_CATALOG_SUPPLEMENT = 'sdxl_styles_all_extra.json'
+
+_all_catalog = None
+
+def load_all_catalog(directory=STYLES_DIR):
+    global _all_catalog
+    file_names = ALL_CATALOG_FILES
+    if os.path.exists(os.path.join(directory, ALL_CATALOG_SUPPLEMENT)):
+        file_names += (ALL_CATALOG_SUPPLEMENT,)
+
+    catalogs = []
+    for file_name in file_names:
+        catalog = load_style_catalog(os.path.join(directory, file_name))
+        if catalog is not None:
+            catalogs.append(catalog)
+    catalogs = tuple(catalogs)
+
+    # Keep handing out the same view until one of the member catalogs is replaced
+    with _catalog_cache_lock:
+        if _all_catalog is None or _all_catalog.catalogs != catalogs:
+            _all_catalog = UnionStyleCatalog(catalogs)
+        return _all_catalog
+
+# Style libraries too large for a JSON array can live in a SQLite database made by
+# import_styles_to_sqlite(). Any category file ending in one of these extensions is opened
+# as a SQLiteStyleCatalog, and SDXL_PROMPT_STYLER_DATABASE (sdxl_styles.sqlite next to this
+# file by default) adds a Prompt Styler Library node when the database exists.
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+STYLE_DATABASE_PATH = os.environ.get("SDXL_PROMPT_STYLER_DATABASE", os.path.join(STYLES_DIR, "sdxl_styles.sqlite"))
+STYLE_DATABASE_SCHEMA = """
+CREATE TABLE styles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    prompt TEXT NOT NULL,
+    negative_prompt TEXT NOT NULL,
+    category TEXT NOT NULL
+);
+CREATE INDEX styles_category ON styles (category);
+CREATE VIRTUAL TABLE styles_text USING fts5 (name, prompt, negative);
+CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+def import_styles_to_sqlite(database_path=None, file_paths=None):
+    # Write the styles of the JSON files into a new database, keeping the first occurrence of
+    # every name in the same order as the "all" catalog. Style ids run from 1 without gaps,
+    # which is what lets a random pick be a single primary key lookup.
+    database_path = database_path or STYLE_DATABASE_PATH
+    if file_paths is None:
+        file_paths = [os.path.join(STYLES_DIR, file_name) for file_name in ALL_CATALOG_FILES]
+        supplement = os.path.join(STYLES_DIR, ALL_CATALOG_SUPPLEMENT)
+        if os.path.exists(supplement):
+            file_paths.append(supplement)
+    categories = {file_name: category for category, file_name, _, _, _ in STYLE_CATEGORIES if file_name}
+
+    temp_path = f"{database_path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.executescript(STYLE_DATABASE_SCHEMA)
+        seen = set()
+        # Hash of the imported rows, stored with them so the catalog version is one query
+        content_hash = hashlib.sha256()
+        for file_path in file_paths:
+            file_name = os.path.basename(file_path)
+            category = categories.get(file_name, os.path.splitext(file_name)[0])
+            rows = []
+            for template in iter_json_array(file_path):
+                if not isinstance(template, dict):
+                    continue
+                name, prompt = template.get('name'), template.get('prompt')
+                if not isinstance(name, str) or not isinstance(prompt, str) or name in seen:
+                    continue
+                seen.add(name)
+                rows.append((name, prompt, template_negative_prompt(template), category))
+            for row in rows:
+                content_hash.update(json.dumps(row).encode('utf8') + b'\n')
+            connection.executemany(
+                "INSERT INTO styles (name, prompt, negative_prompt, category) VALUES (?, ?, ?, ?)", rows)
+        # The placeholder is not part of the searchable text
+        connection.execute(
+            "INSERT INTO styles_text (rowid, name, prompt, negative) "
+            "SELECT id, name, replace(prompt, '{prompt}', ' '), replace(negative_prompt, '{prompt}', ' ') FROM styles")
+        connection.execute("INSERT INTO metadata (key, value) VALUES ('content_hash', ?)", (content_hash.hexdigest(),))
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(temp_path, database_path)
+    return len(seen)
+
+class SQLiteNameSequence:
+    # Read-only sequence of a database's style names in id order, fetched a row at a time, so
+    # the samplers and cycles index into it without loading every name
+    __slots__ = ('catalog',)
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def __len__(self):
+        return len(self.catalog)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        rows = self.catalog.query("SELECT name FROM styles WHERE id = ?", (position + 1,))
+        if not rows:
+            raise IndexError(position)
+        return rows[0][0]
+
+    def __iter__(self):
+        return iter(self.catalog.names)
+
+class SQLiteTextIndex:
+    # Text queries answered by the database's FTS5 table, in FTS5 query syntax
+    __slots__ = ('catalog',)
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def positions(self, query):
+        if not (query or "").strip():
+            return range(len(self.catalog))
+        try:
+            rows = self.catalog.query("SELECT rowid FROM styles_text WHERE styles_text MATCH ? ORDER BY rowid", (query,))
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid query '{query}': {str(e)}")
+        return [row[0] - 1 for row in rows]
+
+    def match(self, query):
+        return bitset_from_positions(self.positions(query))
+
+    def search(self, query):
+        if not (query or "").strip():
+            return list(self.catalog.names)
+        try:
+            rows = self.catalog.query(
+                "SELECT styles.name FROM styles_text JOIN styles ON styles.id = styles_text.rowid "
+                "WHERE styles_text MATCH ? ORDER BY styles.id", (query,))
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid query '{query}': {str(e)}")
+        return [row[0] for row in rows]
+
+class SQLiteNameIndex:
+    # Name search answered by the database's FTS5 table: every word of the query must start a
+    # word of the name. The best bm25 matches are then ranked like StyleNameIndex ranks its
+    # candidates, so a search never reads the whole name column.
+    __slots__ = ('catalog',)
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def __len__(self):
+        return len(self.catalog)
+
+    def search(self, query, limit=20):
+        query = fold_style_name(str(query))
+        words = _text_tokens.findall(query)
+        if not words or limit <= 0:
+            return []
+        match = "name : (" + " ".join(f'"{word}"*' for word in words) + ")"
+        try:
+            rows = self.catalog.query(
+                "SELECT styles.name FROM styles_text JOIN styles ON styles.id = styles_text.rowid "
+                "WHERE styles_text MATCH ? ORDER BY bm25(styles_text) LIMIT ?", (match, max(limit * 8, 64)))
+        except sqlite3.OperationalError as e:
+            print(f"An error occurred: {str(e)}")
+            return []
+        results = []
+        for rank, (name,) in enumerate(rows):
+            folded = fold_style_name(name)
+            if folded == query:
+                score = 2.0
+            elif folded.startswith(query):
+                score = 1.75
+            elif query in folded:
+                score = 1.5
+            else:
+                score = 1.0
+            results.append((score, -rank, name))
+        results.sort(reverse=True)
+        return [(name, score) for score, _, name in results[:limit]]
+
+class SQLiteStyleCatalog(StyleCatalog):
+    # Catalog backed by a database from import_styles_to_sqlite(). Lookups and random picks
+    # are indexed queries, and only the styles actually used are compiled, most recent first
+    # in a bounded cache so the render cache keeps seeing the same style objects.
+    MAX_COMPILED_STYLES = 4096
+
+    def __init__(self, templates=None, file_path=None, fingerprint=None):
+        super().__init__(file_path=file_path, fingerprint=fingerprint)
+        self._connection = None
+        self._size = None
+        self._styles = collections.OrderedDict()
+        self._styles_lock = threading.Lock()
+        self._query_lock = threading.Lock()
+
+    def query(self, sql, parameters=()):
+        with self._query_lock:
+            if self._connection is None:
+                uri = f"file:{urllib.request.pathname2url(self.file_path)}?mode=ro"
+                self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return self._connection.execute(sql, parameters).fetchall()
+
+    @property
+    def loaded(self):
+        return True
+
+    def load(self, previous=None):
+        return self
+
+    @property
+    def index(self):
+        # Every style compiled at once, only for code that needs the whole mapping
+        if self._index is None:
+            rows = self.query("SELECT name, prompt, negative_prompt FROM styles ORDER BY id")
+            pool = {}
+            self._index = {
+                name: CompiledStyle(name, compile_template(prompt, pool), compile_template(negative_prompt, pool))
+                for name, prompt, negative_prompt in rows
+            }
+        return self._index
+
+    @property
+    def selectable_names(self):
+        return SQLiteNameSequence(self)
+
+    @property
+    def names(self):
+        if self._names is None:
+            try:
+                self._names = [row[0] for row in self.query("SELECT name FROM styles ORDER BY id")]
+            except sqlite3.Error as e:
+                print(f"An error occurred: {str(e)}")
+                self._names = []
+        return self._names
+
+    def __len__(self):
+        if self._size is None:
+            self._size = self.query("SELECT count(*) FROM styles")[0][0]
+        return self._size
+
+    def content_hash(self):
+        # Written by import_styles_to_sqlite(), so a large library is not read through to
+        # get its version. Databases without it are hashed whole.
+        try:
+            rows = self.query("SELECT value FROM metadata WHERE key = 'content_hash'")
+        except sqlite3.Error:
+            rows = None
+        if rows:
+            return rows[0][0]
+        return super().content_hash()
+
+    def get(self, template_name):
+        # Route handlers and the executor call this from different threads
+        with self._styles_lock:
+            style = self._styles.get(template_name)
+            if style is not None:
+                self._styles.move_to_end(template_name)
+                return style
+        rows = self.query("SELECT prompt, negative_prompt FROM styles WHERE name = ?", (template_name,))
+        if not rows:
+            return None
+        style = CompiledStyle(template_name, compile_template(rows[0][0]), compile_template(rows[0][1]))
+        with self._styles_lock:
+            # Another thread may have compiled it meanwhile, keep the first one
+            style = self._styles.setdefault(template_name, style)
+            self._styles.move_to_end(template_name)
+            if len(self._styles) > self.MAX_COMPILED_STYLES:
+                self._styles.popitem(last=False)
+        return style
+
+    def has_style(self, template_name):
+        # Every row has a template, so this never loads the names
+        return self.get(template_name) is not None
+
+    def name_page(self, offset, limit):
+        return [row[0] for row in self.query("SELECT name FROM styles WHERE id > ? ORDER BY id LIMIT ?", (offset, limit))]
+
+    def category_weights(self):
+        # Weight of every style so that each category is equally likely, in id order
+        return [row[0] for row in self.query(
+            "SELECT 1.0 / count(*) OVER (PARTITION BY category) FROM styles ORDER BY id")]
+
+    def name_index(self):
+        return SQLiteNameIndex(self)
+
+    def text_index(self):
+        return SQLiteTextIndex(self)
+
+    def check_filters(self, style_filter="", tag_filter=""):
+        # Text filters are FTS5 queries here, which only the database can parse
+        if (style_filter or "").strip():
+            self.text_index().positions(style_filter)
+        evaluate_boolean_query(tag_filter, lambda term: 0, 0)
+
+    def tag_index(self):
+        # Category tags from the category column and keyword tags from the FTS5 table, each
+        # one query, without compiling any style
+        keywords_version, keyword_tags = load_tag_keywords()
+        if self._tag_index is None or self._tag_index[0] != keywords_version:
+            postings = collections.defaultdict(list)
+            for position, category in enumerate(self.query("SELECT category FROM styles ORDER BY id")):
+                postings[normalize_tag(category[0])].append(position)
+            tag_keywords = collections.defaultdict(set)
+            for keyword, tags in keyword_tags.items():
+                for tag in tags:
+                    tag_keywords[tag].add(keyword)
+            for tag, keywords in tag_keywords.items():
+                words = " OR ".join(f'"{keyword}"' for keyword in sorted(keywords))
+                postings[tag].extend(self.text_index().positions(f"prompt:({words})"))
+            self._tag_index = (keywords_version, StyleTagIndex.from_postings(
+                self.selectable_names, {tag: sorted(set(positions)) for tag, positions in postings.items()}))
+        return self._tag_index[1]
+
+def index_style_templates(templates, previous=None):
+    # One pass over any iterable of templates, collecting the combo names and the compiled index
+    names = []
+    index = {}
+    pool = {}
+    for template in templates:
+        if not isinstance(template, dict) or 'name' not in template:
+            continue
+        name = template['name']
+        if type(name) is str:
+            name = sys.intern(name)
+        names.append(name)
+
+        if name in index or not isinstance(template.get('prompt'), str):
+            continue  # The first template with a given name and a prompt wins, same as the old linear scan
+
+        style = previous.get(name) if previous is not None else None
+        if style is None or style.prompt.source != template['prompt'] or style.negative_prompt.source != template_negative_prompt(template):
+            style = CompiledStyle.from_template(template, pool)
+        index[name] = style
+    return names, index
+
+def build_template_index(json_data, previous=None):
+    return index_style_templates(json_data, previous)[1]
+
+def template_negative_prompt(template):
+    negative_prompt = template.get('negative_prompt', "")
+    # Some shipped entries carry null or NaN negatives, treat them as empty
+    return negative_prompt if isinstance(negative_prompt, str) else ""
+
 def read_sdxl_styles(json_data):
+    if isinstance(json_data, StyleCatalog):
+        return json_data.names
+
     if not isinstance(json_data, list):
         print("Error: input data must be a list")
         return None
@@ -26,179 +1350,906 @@ def read_sdxl_styles(json_data):
 
     return names
 
-def read_sdxl_templates_replace_and_combine(json_data, template_name, positive_prompt, negative_prompt):
-    try:
-        if not isinstance(json_data, list):
-            raise ValueError("Invalid JSON data. Expected a list of templates.")
+def find_style(json_data, template_name):
+    if isinstance(json_data, StyleCatalog):
+        return json_data.get(template_name)
 
-        for template in json_data:
-            if 'name' not in template or 'prompt' not in template:
-                continue  # Skip templates that are missing 'name' or 'prompt' fields
+    if not isinstance(json_data, list):
+        raise ValueError("Invalid JSON data. Expected a list of templates.")
+
+    for template in json_data:
+        if 'name' not in template or 'prompt' not in template:
+            continue  # Skip templates that are missing 'name' or 'prompt' fields
+
+        if template['name'] == template_name:
+            return CompiledStyle.from_template(template)
+
+    return None
+
+class RenderCache:
+    # Bounded LRU of rendered (positive, negative) pairs, keyed on the catalog version, the
+    # style name and the inputs. Styles that do not come from a catalog have no version and
+    # are rendered without going through the cache.
+
+    def __init__(self, max_entries=1024, max_bytes=16 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def render(self, style, positive_prompt, negative_prompt, version=None):
+        if self.max_entries <= 0 or version is None:
+            return style.render(positive_prompt, negative_prompt)
+
+        key = (version, style.name, positive_prompt, negative_prompt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        result = style.render(positive_prompt, negative_prompt)
+        # Rough size in bytes of the strings the entry keeps alive
+        size = len(positive_prompt) + len(negative_prompt) + len(result[0]) + len(result[1])
+        if size > self.max_bytes:
+            return result
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (result, size)
+                self._bytes += size
+                self._evict()
+        return result
+
+    def configure(self, max_entries=None, max_bytes=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries until both limits hold, the lock must be held
+        while self._entries and (len(self._entries) > max(self.max_entries, 0) or self._bytes > self.max_bytes):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
 
-            if template['name'] == template_name:
-                prompt = template['prompt'].replace('{prompt}', positive_prompt)
-                positive_prompt = prompt if prompt else positive_prompt
+# Rendered prompts are memoized in front of every styler node. SDXL_PROMPT_STYLER_RENDER_CACHE
+# sets the number of entries kept, 0 turns the cache off.
+render_cache = RenderCache(int(os.environ.get("SDXL_PROMPT_STYLER_RENDER_CACHE", "1024")))
 
-                json_negative_prompt = template.get('negative_prompt', "")
-                if negative_prompt:
-                    negative_prompt = json_negative_prompt.replace('{prompt}', negative_prompt) if json_negative_prompt else negative_prompt
-                else:
-                    negative_prompt = json_negative_prompt
+def get_render_cache_stats():
+    return render_cache.stats()
 
-                return positive_prompt, negative_prompt
+def read_sdxl_templates_replace_and_combine(json_data, template_name, positive_prompt, negative_prompt):
+    try:
+        style = find_style(json_data, template_name)
+        if style is None:
+            raise ValueError(f"No template found with name '{template_name}'.")
 
-        raise ValueError(f"No template found with name '{template_name}'.")
+        if not isinstance(json_data, StyleCatalog):
+            # A raw template list compiles a new style on every call, nothing to reuse
+            return style.render(positive_prompt, negative_prompt)
+        return render_cache.render(style, positive_prompt, negative_prompt, json_data.version)
 
     except Exception as e:
         print(f"An error occurred: {str(e)}")
 
+def style_prompt_batch(json_data, template_names, positive_prompts, negative_prompts):
+    # Render every positive prompt with every style in one pass. Styles are resolved once up
+    # front; the negatives pair with the positives, or a single negative applies to all of them.
+    try:
+        if len(negative_prompts) <= 1:
+            negative_prompts = list(negative_prompts or [""]) * len(positive_prompts)
+        elif len(negative_prompts) != len(positive_prompts):
+            raise ValueError(f"Got {len(negative_prompts)} negative prompts for {len(positive_prompts)} positive prompts.")
+
+        styles = []
+        for template_name in template_names:
+            style = find_style(json_data, template_name)
+            if style is None:
+                raise ValueError(f"No template found with name '{template_name}'.")
+            styles.append(style)
+
+        positive_out = []
+        negative_out = []
+        style_out = []
+        for positive_prompt, negative_prompt in zip(positive_prompts, negative_prompts):
+            for style in styles:
+                positive, negative = style.render(positive_prompt, negative_prompt)
+                positive_out.append(positive)
+                negative_out.append(negative)
+                style_out.append(style.name)
+        return positive_out, negative_out, style_out
 
-class SDXLPromptStylerMisc:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_misc.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+        return [], [], []
+
+def resolve_styles(json_data, template_names):
+    styles = []
+    for template_name in template_names:
+        style = find_style(json_data, template_name)
+        if style is None:
+            raise ValueError(f"No template found with name '{template_name}'.")
+        styles.append(style)
+    return styles
+
+def style_grid_size(axes, prompts):
+    total = len(prompts)
+    for _, template_names in axes:
+        total *= len(template_names)
+    return total
+
+def iter_style_grid(axes, prompts, start=0):
+    # Lazily walk prompts x axis 1 x axis 2 ... in row-major order, beginning at position start.
+    # Each axis is a (catalog, style names) pair and prompts are (positive, negative) pairs.
+    # The styles of a cell are applied in axis order, each wrapping the result of the previous
+    # one, the same as chaining styler nodes. Memory does not grow with the size of the grid.
+    styles = [resolve_styles(json_data, template_names) for json_data, template_names in axes]
+    sizes = [len(prompts)] + [len(axis) for axis in styles]
+    total = style_grid_size(axes, prompts)
+    if start >= total:
+        return
+
+    # Turn the start position into one digit per axis and count up from there
+    digits = []
+    remainder = start
+    for size in reversed(sizes):
+        remainder, digit = divmod(remainder, size)
+        digits.append(digit)
+    digits.reverse()
+
+    for position in range(start, total):
+        positive_prompt, negative_prompt = prompts[digits[0]]
+        names = []
+        for axis, digit in enumerate(digits[1:]):
+            style = styles[axis][digit]
+            positive_prompt, negative_prompt = style.render(positive_prompt, negative_prompt)
+            names.append(style.name)
+        yield position, positive_prompt, negative_prompt, tuple(names)
+
+        for axis in range(len(digits) - 1, -1, -1):
+            digits[axis] += 1
+            if digits[axis] < sizes[axis]:
+                break
+            digits[axis] = 0
+
+_name_separators = re.compile(r'[\W_]+')
+
+def fold_style_name(text):
+    # Lowercase with punctuation and underscores read as word breaks, so "Icelandic graffiti"
+    # finds "Contemporary_Icelandic_Graffiti_Art"
+    return ' '.join(_name_separators.sub(' ', text.lower()).split())
+
+def name_trigrams(text):
+    # Padded trigrams of the folded text, so short queries and word starts still match
+    text = f"  {fold_style_name(text)} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class StyleNameIndex:
+    # Trigram index over style names for fuzzy lookup. Candidates are the names sharing the
+    # most trigrams with the query, then ranked by trigram similarity with a bonus for names
+    # that contain the query outright.
+    __slots__ = ('names', 'folded', 'sizes', 'postings')
+
+    def __init__(self, names):
+        self.names = tuple(dict.fromkeys(name for name in names if isinstance(name, str)))
+        self.folded = tuple(fold_style_name(name) for name in self.names)
+        postings = collections.defaultdict(list)
+        sizes = []
+        for name_id, name in enumerate(self.names):
+            trigrams = name_trigrams(name)
+            sizes.append(len(trigrams))
+            for trigram in trigrams:
+                postings[trigram].append(name_id)
+        self.sizes = tuple(sizes)
+        self.postings = {trigram: tuple(ids) for trigram, ids in postings.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query, limit=20):
+        # Ranked (name, score) pairs, best first, score in [0, 2]
+        query = fold_style_name(str(query))
+        if not query or limit <= 0:
+            return []
+
+        trigrams = name_trigrams(query)
+        shared = collections.Counter()
+        for trigram in trigrams:
+            ids = self.postings.get(trigram)
+            if ids:
+                shared.update(ids)
+        if not shared:
+            return []
+
+        # Only the best few candidates by shared trigrams are scored in full
+        query_size = len(trigrams)
+        candidates = sorted(shared.items(), key=operator.itemgetter(1), reverse=True)
+        results = []
+        for name_id, count in candidates[:max(limit * 8, 64)]:
+            score = count / (query_size + self.sizes[name_id] - count)
+            folded = self.folded[name_id]
+            if folded == query:
+                score += 1.0
+            elif folded.startswith(query):
+                score += 0.75
+            elif query in folded:
+                score += 0.5
+            results.append((score, -name_id))
+        results.sort(reverse=True)
+        return [(self.names[-name_id], round(score, 4)) for score, name_id in results[:limit]]
+
+def search_style_names(category, query, limit=20):
+    # Fuzzy search over the names of a category, "all" searches every category. Takes a
+    # category id or a catalog.
+    catalog = category if isinstance(category, StyleCatalog) else load_category_catalog(category)
+    if catalog is None:
+        return []
+    return catalog.name_index().search(query, limit)
+
+_text_tokens = re.compile(r'[^\W_]+')
+
+def template_tokens(template):
+    # Words of a template's text, without its {prompt} placeholder
+    return frozenset(token for segment in template.segments for token in _text_tokens.findall(segment.lower()))
+
+def bitset_from_positions(positions):
+    bits = 0
+    for position in positions:
+        bits |= 1 << position
+    return bits
+
+def bitset_positions(bits):
+    # Indices of the set bits, lowest first
+    digits = bin(bits)[:1:-1]
+    position = digits.find('1')
+    while position >= 0:
+        yield position
+        position = digits.find('1', position + 1)
+
+_query_token = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+QUERY_OPERATORS = ('AND', 'OR', 'NOT')
+
+def evaluate_boolean_query(query, term, universe):
+    # Evaluate AND / OR / NOT / parentheses over bitsets, term(text) giving the bitset of one
+    # term. Terms next to each other are ANDed, NOT binds tightest, then AND, then OR. A blank
+    # query is the universe, a malformed one raises ValueError.
+    tokens = _query_token.findall(query or "")
+    if not tokens:
+        return universe
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def parse_or():
+        nonlocal position
+        bits = parse_and()
+        while peek() == 'OR':
+            position += 1
+            bits |= parse_and()
+        return bits
+
+    def parse_and():
+        nonlocal position
+        bits = parse_not()
+        while peek() is not None and peek() not in ('OR', ')'):
+            if peek() == 'AND':
+                position += 1
+            bits &= parse_not()
+        return bits
+
+    def parse_not():
+        nonlocal position
+        if peek() == 'NOT':
+            position += 1
+            return universe & ~parse_not()
+        return parse_atom()
+
+    def parse_atom():
+        nonlocal position
+        token = peek()
+        if token is None or token in QUERY_OPERATORS or token == ')':
+            raise ValueError(f"Unexpected {token or 'end'} in query '{query}'.")
+        position += 1
+        if token == '(':
+            bits = parse_or()
+            if peek() != ')':
+                raise ValueError(f"Missing ) in query '{query}'.")
+            position += 1
+            return bits
+        return term(token.strip('"'))
+
+    bits = parse_or()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected {tokens[position]} in query '{query}'.")
+    return bits
+
+class StyleTextIndex:
+    # Inverted index from the words of the positive and negative templates to the styles that
+    # use them. Posting lists are int bitsets over the style positions, so boolean queries
+    # are a handful of big-int operations.
+    __slots__ = ('names', 'tokens', 'postings', 'vocabulary', 'universe')
+    FIELDS = ('prompt', 'negative')
+
+    def __init__(self, names, index, previous=()):
+        # previous holds older or member indexes whose tokens are reused for identical styles
+        self.names = tuple(names)
+        reuse = {}
+        for old in previous:
+            for name, entry in old.tokens.items():
+                reuse.setdefault(name, entry)
+
+        self.tokens = {}
+        positions = {field: collections.defaultdict(list) for field in self.FIELDS}
+        for position, name in enumerate(self.names):
+            style = index[name]
+            entry = reuse.get(name)
+            if entry is None or entry[0] is not style:
+                entry = (style, template_tokens(style.prompt), template_tokens(style.negative_prompt))
+            self.tokens[name] = entry
+            for token in entry[1]:
+                positions['prompt'][token].append(position)
+            for token in entry[2]:
+                positions['negative'][token].append(position)
+
+        self.postings = {
+            field: {token: bitset_from_positions(token_positions) for token, token_positions in field_positions.items()}
+            for field, field_positions in positions.items()
         }
+        # Sorted words of each field, for prefix lookups
+        self.vocabulary = {field: tuple(sorted(postings)) for field, postings in self.postings.items()}
+        self.universe = (1 << len(self.names)) - 1
+
+    def term(self, text):
+        # prompt:word and negative:word look in one template, a bare word in either. A
+        # trailing * matches every word with that prefix, and "quoted words" must all occur.
+        fields = self.FIELDS
+        field, separator, rest = text.partition(':')
+        if separator and field.lower() in self.FIELDS:
+            fields, text = (field.lower(),), rest
+        prefix = text.endswith('*')
+        words = _text_tokens.findall(text.lower())
+        if not words:
+            raise ValueError(f"Empty search term '{text}'.")
+
+        bits = self.universe
+        for i, word in enumerate(words):
+            word_bits = 0
+            for field in fields:
+                postings = self.postings[field]
+                if prefix and i == len(words) - 1:
+                    vocabulary = self.vocabulary[field]
+                    for token in vocabulary[bisect.bisect_left(vocabulary, word):]:
+                        if not token.startswith(word):
+                            break
+                        word_bits |= postings[token]
+                else:
+                    word_bits |= postings.get(word, 0)
+            bits &= word_bits
+        return bits
+
+    def match(self, query):
+        # Bitset of the styles matching a boolean query, a blank query matches every style
+        return evaluate_boolean_query(query, self.term, self.universe)
+
+    def search(self, query):
+        # Names of the matching styles, in catalog order
+        return [self.names[position] for position in bitset_positions(self.match(query))]
+
+def search_style_text(category, query):
+    # Styles of a category whose templates match a boolean query such as
+    # 'fog OR mist', '35mm AND NOT negative:blurry' or 'prompt:chiaro*'
+    catalog = load_category_catalog(category)
+    if catalog is None:
+        return []
+    try:
+        return catalog.text_index().search(query)
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        return []
+
+# Tags derived from the words of a style's positive template. Override or extend them with a
+# JSON object of tag to keywords in sdxl_prompt_styler_tags.json next to this file.
+TAG_KEYWORDS = {
+    "portrait": ("portrait", "portraits", "headshot", "selfie", "face", "faces"),
+    "landscape": ("landscape", "landscapes", "scenery", "vista", "panorama", "mountains"),
+    "monochrome": ("monochrome", "monochromatic", "grayscale", "greyscale", "sepia", "noir"),
+    "photo": ("photo", "photograph", "photography", "photographic", "photorealistic", "35mm", "dslr", "lens"),
+    "painting": ("painting", "painted", "oil", "watercolor", "watercolour", "acrylic", "brushstrokes", "canvas"),
+    "illustration": ("illustration", "illustrated", "drawing", "sketch", "ink", "comic", "cartoon"),
+    "anime": ("anime", "manga"),
+    "3d": ("3d", "render", "rendering", "cgi", "octane", "blender"),
+    "dark": ("dark", "gloomy", "shadowy", "moody", "ominous", "eerie", "sinister"),
+    "bright": ("bright", "vibrant", "colorful", "colourful", "saturated", "luminous"),
+    "vintage": ("vintage", "retro", "antique", "nostalgic", "victorian"),
+    "night": ("night", "nighttime", "nocturnal", "moonlight", "midnight"),
+    "nature": ("nature", "forest", "floral", "flowers", "wildlife", "botanical"),
+    "urban": ("urban", "city", "cityscape", "street", "skyscrapers"),
+    "fantasy": ("fantasy", "magical", "mythical", "enchanted", "dragon", "fairy"),
+    "scifi": ("futuristic", "cyberpunk", "spaceship", "robot", "robotic", "android"),
+    "minimal": ("minimal", "minimalist", "minimalism", "simple", "clean"),
+}
+TAG_KEYWORDS_FILE = os.path.join(STYLES_DIR, 'sdxl_prompt_styler_tags.json')
+_tag_keywords = None
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
+def normalize_tag(text):
+    # Lowercase with spaces and dashes folded to underscores, like the category ids
+    return re.sub(r'[\s\-]+', '_', str(text).strip().lower())
 
-        return positive_prompt, negative_prompt
+def load_tag_keywords():
+    # (version, keyword -> tags) for the built-in keywords merged with the keywords file,
+    # reread only when the file changes
+    global _tag_keywords
+    try:
+        version = file_fingerprint(TAG_KEYWORDS_FILE)
+    except OSError:
+        version = None
+    if _tag_keywords is None or _tag_keywords[0] != version:
+        tag_keywords = dict(TAG_KEYWORDS)
+        if version is not None:
+            overrides = read_json_file(TAG_KEYWORDS_FILE)
+            if isinstance(overrides, dict):
+                for tag, keywords in overrides.items():
+                    tag_keywords[tag] = [keywords] if isinstance(keywords, str) else keywords
+            else:
+                print(f"Error: {TAG_KEYWORDS_FILE} must contain a JSON object of tag keywords.")
+        keyword_tags = collections.defaultdict(set)
+        for tag, keywords in tag_keywords.items():
+            for keyword in keywords or ():
+                for word in _text_tokens.findall(str(keyword).lower()):
+                    keyword_tags[word].add(normalize_tag(tag))
+        _tag_keywords = (version, {keyword: frozenset(tags) for keyword, tags in keyword_tags.items()})
+    return _tag_keywords
+
+def style_file_category(file_path):
+    # Category id of a styles file, or the file name for files outside the registry
+    file_name = os.path.basename(file_path)
+    for category, category_file in CATEGORY_FILES.items():
+        if category_file and os.path.basename(category_file) == file_name:
+            return category
+    return normalize_tag(os.path.splitext(file_name)[0])
+
+def read_declared_tags(file_path):
+    # Tags listed on the styles themselves, as "tags": ["portrait", "moody"] or "portrait, moody"
+    try:
+        with open(file_path, 'rb') as file:
+            if b'"tags"' not in file.read():
+                return {}
+        declared = {}
+        for template in iter_json_array(file_path):
+            if not isinstance(template, dict) or not isinstance(template.get('name'), str):
+                continue
+            tags = template.get('tags')
+            if isinstance(tags, str):
+                tags = tags.split(',')
+            if isinstance(tags, list):
+                declared.setdefault(template['name'], set()).update(
+                    normalize_tag(tag) for tag in tags if isinstance(tag, str) and tag.strip())
+        return declared
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+        return {}
+
+class StyleTagIndex:
+    # Tag -> int bitset over the style positions, so a tag query such as
+    # 'horror AND portrait AND NOT monochrome' is a few bitwise operations
+    __slots__ = ('names', 'tags', 'postings', 'universe')
+
+    def __init__(self, names, style_tags):
+        self.names = names
+        self.tags = style_tags
+        positions = collections.defaultdict(list)
+        for position, name in enumerate(names):
+            for tag in style_tags.get(name, ()):
+                positions[tag].append(position)
+        self.postings = {tag: bitset_from_positions(tag_positions) for tag, tag_positions in positions.items()}
+        self.universe = (1 << len(names)) - 1
 
-class SDXLPromptStylerAll:
+    @classmethod
+    def from_postings(cls, names, postings):
+        index = cls.__new__(cls)
+        index.names = names
+        index.tags = None
+        index.postings = {tag: bitset_from_positions(positions) for tag, positions in postings.items()}
+        index.universe = (1 << len(names)) - 1
+        return index
+
+    def term(self, text):
+        return self.postings.get(normalize_tag(text), 0)
+
+    def match(self, query):
+        return evaluate_boolean_query(query, self.term, self.universe)
+
+    def search(self, query):
+        return [self.names[position] for position in bitset_positions(self.match(query))]
+
+    def tag_counts(self):
+        return {tag: bin(bits).count('1') for tag, bits in sorted(self.postings.items())}
+
+def search_style_tags(category, query):
+    # Styles of a category whose tags match a boolean query such as
+    # 'horror AND portrait AND NOT monochrome'
+    catalog = load_category_catalog(category)
+    if catalog is None:
+        return []
+    try:
+        return catalog.tag_index().search(query)
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        return []
+
+# The watcher reloads edited style files in the background using inotify where available and
+# mtime polling elsewhere. Set SDXL_PROMPT_STYLER_WATCH=0 to rely on the stat check that
+# every catalog lookup already does.
+WATCH_CATALOGS = os.environ.get("SDXL_PROMPT_STYLER_WATCH", "1") != "0"
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+
+class _Inotify:
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def wait(self, timeout):
+        # True once a style file was written, replaced or removed
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return False
+
+        changed = False
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = struct.unpack_from("iIII", data, offset)
+            name = data[offset + 16:offset + 16 + length].split(b"\0", 1)[0]
+            changed = changed or fnmatch.fnmatch(os.fsdecode(name), 'sdxl_styles_*.json')
+            offset += 16 + length
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class CatalogWatcher:
+
+    def __init__(self, directory=STYLES_DIR, interval=2.0):
+        self.directory = directory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sdxl-styles-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        inotify = None
+        if sys.platform.startswith("linux"):
+            try:
+                inotify = _Inotify(self.directory)
+            except (OSError, AttributeError, TypeError):
+                inotify = None
+
+        try:
+            while not self._stop.is_set():
+                if inotify is not None:
+                    if not inotify.wait(self.interval):
+                        continue
+                elif self._stop.wait(self.interval):
+                    break
+                refresh_style_catalogs(self.directory)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+
+# Every styler node: category id, style file, node class name, display name and the position
+# of the category's styles in the "all" catalog. The "all" category has no file of its own,
+# it is the union of the category files in that order, and a name listed by several of them
+# resolves to the first. Adding a category only takes a new row here and its
+# sdxl_styles_*.json file; a position of None leaves the category out of "all".
+STYLE_CATEGORIES = (
+    ("all", None, "SDXLPromptStylerAll", "Prompt Styler All", None),
+    ("artist", "sdxl_styles_artists.json", "SDXLPromptStylerbyArtist", "Prompt Styler Artist", 1),
+    ("camera", "sdxl_styles_camera.json", "SDXLPromptStylerbyCamera", "Prompt Styler Camera", 2),
+    ("celtic_art", "sdxl_styles_celticart.json", "SDXLPromptbyCelticArt", "Prompt Styler Celtic Art", 3),
+    ("composition", "sdxl_styles_composition.json", "SDXLPromptStylerbyComposition", "Prompt Styler Composition", 4),
+    ("contemporary_nordic_art", "sdxl_styles_contempnordic.json", "SDXLPromptbyContemporaryNordicArt", "Prompt Styler Contemporary Nordic Art", 33),
+    ("cyberpunk_surrealism", "sdxl_styles_cs.json", "SDXLPromptStylerbyCyberpunkSurrealism", "Prompt Styler Cyberpunk Surrealism", 5),
+    ("depth", "sdxl_styles_depth.json", "SDXLPromptStylerbyDepth", "Prompt Styler Depth", 6),
+    ("environment", "sdxl_styles_environment.json", "SDXLPromptStylerbyEnvironment", "Prompt Styler Environment", 7),
+    ("fantasy_setting", "sdxl_styles_fs.json", "SDXLPromptStylerbyFantasySetting", "Prompt Styler Fantasy-Setting", 11),
+    ("fashion_art", "sdxl_styles_fashion.json", "SDXLPromptbyFashionArt", "Prompt Styler Fashion", 8),
+    ("filter", "sdxl_styles_filter.json", "SDXLPromptStylerbyFilter", "Prompt Styler Filter", 9),
+    ("focus", "sdxl_styles_focus.json", "SDXLPromptStylerbyFocus", "Prompt Styler Focus", 10),
+    ("gothic_revival", "sdxl_styles_gothrev.json", "SDXLPromptbyGothicRevival", "Prompt Styler Gothic Revival", 12),
+    ("horror", "sdxl_styles_horror.json", "SDXLPromptStylerHorror", "Prompt Styler Horror", 13),
+    ("icelandic_contemporary_art", "sdxl_styles_iclandiccontemp.json", "SDXLPromptbyIcelandicContemporaryArt", "Prompt Styler Icelandic Contemporary Art", 34),
+    ("impressionism", "sdxl_styles_impressionism.json", "SDXLPromptStylerbyImpressionism", "Prompt Styler Impressionism", 14),
+    ("irish_folk_art", "sdxl_styles_irishfolkart.json", "SDXLPromptbyIrishFolkArt", "Prompt Styler Irish Folk Art", 15),
+    ("lighting", "sdxl_styles_lighting.json", "SDXLPromptStylerbyLighting", "Prompt Styler Lighting", 16),
+    ("milehigh", "sdxl_styles_mh.json", "SDXLPromptStylerbyMileHigh", "Prompt Styler MileHigh", 18),
+    ("misc", "sdxl_styles_misc.json", "SDXLPromptStylerMisc", "Prompt Styler Misc", 19),
+    ("mood", "sdxl_styles_mood.json", "SDXLPromptStylerbyMood", "Prompt Styler Mood", 20),
+    ("mythical_creature", "sdxl_styles_mc.json", "SDXLPromptStylerbyMythicalCreature", "Prompt Styler Mythical Creature", 17),
+    ("original", "sdxl_styles_original.json", "SDXLPromptStylerbyOriginal", "Prompt Styler Original", 21),
+    ("quantum_realism", "sdxl_styles_qr.json", "SDXLPromptStylerbyQuantumRealism", "Prompt Styler Quantum Realism", 22),
+    ("romantic_nationalism_art", "sdxl_styles_romanticnat.json", "SDXLPromptbyRomanticNationalismArt", "Prompt Styler Romantic Nationalism", 32),
+    ("sports_art", "sdxl_styles_sports.json", "SDXLPromptbySportsArt", "Prompt Styler Sports", 23),
+    ("steampunk_realism", "sdxl_styles_sr.json", "SDXLPromptStylerbySteamPunkRealism", "Prompt Styler SteamPunk Realism", 24),
+    ("street_art", "sdxl_styles_street.json", "SDXLPromptbyStreetArt", "Prompt Styler Street", 25),
+    ("subject", "sdxl_styles_subject.json", "SDXLPromptStylerbySubject", "Prompt Styler Subject", 26),
+    ("surrealism", "sdxl_styles_surrealism.json", "SDXLPromptStylerbySurrealism", "Prompt Styler Surrealism", 27),
+    ("theme", "sdxl_styles_themes.json", "SDXLPromptStylerbyTheme", "Prompt Styler Theme", 28),
+    ("time_of_day", "sdxl_styles_tod.json", "SDXLPromptStylerbyTimeofDay", "Prompt Styler Time of Day", 29),
+    ("viking_art", "sdxl_styles_viking.json", "SDXLPromptbyVikingArt", "Prompt Styler Viking Art", 31),
+    ("wildlife_art", "sdxl_styles_wildlife.json", "SDXLPromptbyWildlifeArt", "Prompt Styler Wildlife", 30),
+    ("wyvern", "sdxl_styles_wyvern.json", "SDXLPromptStylerbyWyvern", "Prompt Styler Wyvern", 35),
+)
+
+if os.path.exists(STYLE_DATABASE_PATH):
+    STYLE_CATEGORIES += (("library", STYLE_DATABASE_PATH, "SDXLPromptStylerLibrary", "Prompt Styler Library", None),)
+
+CATEGORY_FILES = {category: file_name for category, file_name, _, _, _ in STYLE_CATEGORIES}
+ALL_CATALOG_FILES = tuple(file_name for _, file_name, _, _, all_order in
+                          sorted((row for row in STYLE_CATEGORIES if row[4] is not None), key=operator.itemgetter(4)))
+
+def load_category_catalog(category):
+    file_name = CATEGORY_FILES.get(category)
+    if file_name is None:
+        return load_all_catalog() if category == "all" else None
+    return load_style_catalog(os.path.join(STYLES_DIR, file_name))
+
+# Paging through style names for clients that do not take the whole combo list. Fuzzy name
+# queries rank at most MAX_RANKED_STYLES names.
+MAX_RANKED_STYLES = 500
+
+def list_style_names(category, offset=0, limit=100, query="", text="", tags=""):
+    # One page of a category's style names as (total, names), optionally narrowed by a fuzzy
+    # name query, a text query and a tag query. Plain listing follows the combo order, a name
+    # query returns the best matches first. Takes a category id or a catalog, and returns None
+    # for an unknown category.
+    catalog = category if isinstance(category, StyleCatalog) else load_category_catalog(category)
+    if catalog is None:
+        return None
+    offset, limit = max(offset, 0), max(limit, 0)
+
+    if text or tags:
+        bits = -1
+        if text:
+            bits &= catalog.text_index().match(text)
+        if tags:
+            bits &= catalog.tag_index().match(tags)
+        selectable_names = catalog.selectable_names
+        if not query:
+            positions = itertools.islice(bitset_positions(bits), offset, offset + limit)
+            return bin(bits).count('1'), [selectable_names[position] for position in positions]
+        allowed = {selectable_names[position] for position in bitset_positions(bits)}
+    else:
+        allowed = None
+
+    if query:
+        names = [name for name, _ in catalog.name_index().search(query, MAX_RANKED_STYLES)]
+        if allowed is not None:
+            names = [name for name in names if name in allowed]
+    else:
+        return len(catalog), catalog.name_page(offset, limit)
+    return len(names), names[offset:offset + limit]
+
+# Set SDXL_PROMPT_STYLER_COMBO_LIMIT to inline at most that many style names in each node's
+# combo, 0 (the default) inlines them all. Styles past the limit are still accepted, and
+# GET /sdxl_prompt_styler/styles pages through the full list.
+COMBO_LIMIT = int(os.environ.get("SDXL_PROMPT_STYLER_COMBO_LIMIT", "0"))
+
+def catalog_fingerprint(catalog, inputs):
+    # IS_CHANGED value of a styler node: the same inputs against the same catalog version
+    # give the same string, so ComfyUI keeps the cached outputs until one of them changes
+    version = catalog.version if catalog is not None else None
+    weights_version = None
+    if inputs.get("auto_select_style") and inputs.get("weighting") == "weights file":
+        try:
+            weights_version = file_fingerprint(resolve_weights_file(inputs.get("weights_file")))
+        except OSError:
+            pass
+    state = repr((version, weights_version, sorted(inputs.items())))
+    return hashlib.blake2b(state.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+def categories_fingerprint(inputs):
+    # IS_CHANGED value of the nodes that name their categories in the inputs (category,
+    # axis_1_category, ...). Only the versions of those categories count, so the library
+    # is covered too and an edit to an unrelated category leaves the node cached.
+    categories = set()
+    for key, value in inputs.items():
+        if key == "category" or key.endswith("_category"):
+            # List nodes get every input as a list
+            categories.update(value if isinstance(value, list) else [value])
+    versions = []
+    for category in sorted(categories, key=str):
+        catalog = load_category_catalog(category)
+        versions.append((category, catalog.version if catalog is not None else None))
+    state = repr((versions, sorted(inputs.items())))
+    return hashlib.blake2b(state.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+class SDXLPromptStylerNode:
+    # Shared implementation of every styler node, the generated subclasses only set CATEGORY_ID
+    CATEGORY_ID = None
+    # Nodes that can pick their style at random get the seed and weighting inputs
+    RANDOM_SELECTION = False
 
     def __init__(self):
-        pass
+        # Reseeded on every random pick, so the style depends on the seed alone
+        self.rng = random.Random()
+
+    @classmethod
+    def load_catalog(cls):
+        return load_category_catalog(cls.CATEGORY_ID)
 
     @classmethod
     def INPUT_TYPES(cls):
-        p = os.path.dirname(os.path.realpath(__file__))
-        file_path = os.path.join(p, 'sdxl_styles_all.json')
-        cls.json_data = read_json_file(file_path)
-        styles = read_sdxl_styles(cls.json_data)
+        # The spec is built once per catalog snapshot and the same object is handed out until
+        # the catalog is reloaded, so callers must treat it as read-only
+        catalog = cls.load_catalog()
+        cached = cls.__dict__.get('_input_types')
+        if cached is not None and cached[0] is catalog:
+            return cached[1]
+
+        input_types = cls.build_input_types(catalog)
+        if catalog is not None:
+            cls._input_types = (catalog, input_types)
+        return input_types
 
-        return {
+    @classmethod
+    def build_input_types(cls, catalog):
+        if isinstance(catalog, SQLiteStyleCatalog):
+            # A database can hold far more styles than a combo list should carry. The style is
+            # a string, and the web extension fills a picker from /sdxl_prompt_styler/styles
+            # for the category named by style_list.
+            names = catalog.name_page(0, 1)
+            style_input = ("STRING", {"default": names[0] if names else "", "style_list": cls.CATEGORY_ID,
+                                      "catalog_version": catalog.version})
+        else:
+            styles = read_sdxl_styles(catalog)
+            if COMBO_LIMIT > 0 and styles and len(styles) > COMBO_LIMIT:
+                styles = styles[:COMBO_LIMIT]
+            # The version lets clients tell whether the style list changed
+            style_input = ((styles), {"catalog_version": catalog.version} if catalog is not None else {})
+
+        input_types = {
             "required": {
                 "text_positive": ("STRING", {"default": "", "multiline": True}),
                 "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
+                "style": style_input,
                 "log_prompt": (["No", "Yes"], {"default":"No"}),
             },
-            "optional": {
+        }
+        if cls.RANDOM_SELECTION:
+            # New inputs go last, widget values of saved workflows are matched by position
+            input_types["optional"] = {
                 "auto_select_style": ("BOOLEAN", {"default": False}),
-                "auto_refresh": ("BOOLEAN", {"default": False}),
+                "selection_mode": (SELECTION_MODES, {"default": "random"}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "weighting": (SAMPLER_WEIGHTINGS, {"default": "uniform"}),
+                "weights_file": ("STRING", {"default": DEFAULT_WEIGHTS_FILE}),
+                # Boolean query over the template text, e.g. fog OR mist, empty for every style
+                "style_filter": ("STRING", {"default": ""}),
+                # Boolean query over the style tags, e.g. horror AND portrait AND NOT monochrome
+                "tag_filter": ("STRING", {"default": ""}),
             }
-        }
-    
-    @classmethod
-    def IS_CHANGED(cls, text, autorefresh):
-        # Force re-evaluation of the node
-        if auto_refresh == "True":
-            return float("NaN")
-
-    def get_prompt(self, text: str, autorefresh: str) -> tuple[str]:
-        prompt = self.generate_prompt(text)
-        print(f"Prompt: {prompt}")
+        return input_types
 
-        return (prompt,)
-
-    @abstractmethod
-    def generate_prompt(self, text: str) -> str:
-        ...
-
-    
     RETURN_TYPES = ('STRING','STRING',)
     RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
     FUNCTION = 'prompt_styler'
     CATEGORY = 'Style Prompts'
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt, auto_select_style=False, auto_refresh=False):
-        if auto_select_style or auto_refresh:
-            style = random.choice([template['name'] for template in self.json_data])
-
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        # Introduce a timestamp-based change using the current time
-        current_time = int(time.time())
-        dummy_change = current_time
-
-        return positive_prompt, negative_prompt, dummy_change
-        dummy_change = current_time
-
-        return positive_prompt, negative_prompt, dummy_change   # Include dummy_change to trigger execution
-        
-
-class SDXLPromptStylerHorror:
-
-    def __init__(self):
-        pass
-
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_horror.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+    def VALIDATE_INPUTS(cls, style=None, auto_select_style=None, style_filter=None, tag_filter=None):
+        # Styles are checked against the catalog rather than the combo list, which may have
+        # been cut short by SDXL_PROMPT_STYLER_COMBO_LIMIT. Linked inputs arrive as None.
+        catalog = cls.load_catalog()
+        if catalog is None:
+            return True
+        if auto_select_style is not False:
+            try:
+                catalog.check_filters(style_filter, "")
+            except ValueError as e:
+                return f"Invalid style_filter: {str(e)}"
+            try:
+                catalog.check_filters("", tag_filter)
+            except ValueError as e:
+                return f"Invalid tag_filter: {str(e)}"
+        if style is None or catalog.has_style(style):
+            return True
+        return f"Style '{style}' is not in the {cls.CATEGORY_ID} styles."
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # A cycle moves on to the next style on every run
+        if kwargs.get("auto_select_style") and kwargs.get("selection_mode") == "cycle":
+            return float("NaN")
+        return catalog_fingerprint(cls.load_catalog(), kwargs)
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
+    @classmethod
+    def cycle_key(cls, weighting, weights_file, style_filter="", tag_filter=""):
+        # The seed is not part of the key, a cycle records the seed it started with
+        if weighting != "weights file":
+            weights_file = None
+        key = f"{cls.CATEGORY_ID}|{weighting}|{weights_file or ''}"
+        style_filter = (style_filter or "").strip()
+        tag_filter = (tag_filter or "").strip()
+        if style_filter:
+            key = f"{key}|{style_filter}"
+        if tag_filter:
+            key = f"{key}|tags:{tag_filter}"
+        return key
+
+    def select_style(self, catalog, seed=0, weighting="uniform", weights_file=DEFAULT_WEIGHTS_FILE, selection_mode="random",
+                     style_filter="", tag_filter=""):
+        sampler = catalog.sampler(weighting, weights_file, style_filter, tag_filter)
+        if selection_mode == "cycle":
+            key = self.cycle_key(weighting, weights_file, style_filter, tag_filter)
+            return style_cycle.draw(key, seed, sampler.pool)
+        self.rng.seed(seed)
+        return sampler.sample(self.rng)
+
+    def prompt_styler(self, text_positive, text_negative, style, log_prompt, auto_select_style=False,
+                      seed=0, weighting="uniform", weights_file=DEFAULT_WEIGHTS_FILE, selection_mode="random",
+                      style_filter="", tag_filter=""):
+        catalog = self.load_catalog()
+        if auto_select_style and catalog is not None:
+            selected = self.select_style(catalog, seed, weighting, weights_file, selection_mode, style_filter, tag_filter)
+            if selected is None:
+                # Filters that match nothing leave the chosen style in place
+                print(f"Error: No {self.CATEGORY_ID} style matches the style and tag filters, keeping style '{style}'.")
+            else:
+                style = selected
+
+        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(catalog, style, text_positive, text_negative)
 
         if log_prompt == "Yes":
             print(f"style: {style}")
@@ -209,214 +2260,232 @@ class SDXLPromptStylerHorror:
 
         return positive_prompt, negative_prompt
 
-class SDXLPromptStylerbyArtist:
-
-    def __init__(self):
-        pass
+class SDXLPromptStylerAllNode(SDXLPromptStylerNode):
+    RANDOM_SELECTION = True
 
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_artists.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
+    def build_input_types(cls, catalog):
+        input_types = super().build_input_types(catalog)
+        # Saved workflows restore widget values by position, so auto_refresh keeps its place
+        # right after auto_select_style and the newer inputs follow it
+        optional = input_types["optional"]
+        input_types["optional"] = {
+            "auto_select_style": optional.pop("auto_select_style"),
+            "auto_refresh": ("BOOLEAN", {"default": False}),
+            **optional,
         }
+        return input_types
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyFocus:
+    @classmethod
+    def IS_CHANGED(cls, auto_refresh=False, **kwargs):
+        # auto_refresh picks a new style on every run regardless of the seed
+        if auto_refresh:
+            return float("NaN")
+        return super().IS_CHANGED(**kwargs)
+
+    def prompt_styler(self, text_positive, text_negative, style, log_prompt, auto_select_style=False,
+                      auto_refresh=False, seed=0, weighting="uniform", weights_file=DEFAULT_WEIGHTS_FILE,
+                      selection_mode="random", style_filter="", tag_filter=""):
+        if auto_refresh:
+            # Seeding with None draws from system entropy
+            auto_select_style, seed, selection_mode = True, None, "random"
+        return super().prompt_styler(text_positive, text_negative, style, log_prompt,
+                                     auto_select_style, seed, weighting, weights_file, selection_mode, style_filter,
+                                     tag_filter)
+
+# Categories whose node offers seeded random selection besides "all"
+RANDOM_SELECTION_CATEGORIES = frozenset(("icelandic_contemporary_art", "library"))
+
+def make_styler_node(category, class_name):
+    base = SDXLPromptStylerAllNode if category == "all" else SDXLPromptStylerNode
+    attributes = {"CATEGORY_ID": category}
+    if category in RANDOM_SELECTION_CATEGORIES:
+        attributes["RANDOM_SELECTION"] = True
+    return type(class_name, (base,), attributes)
+
+class SDXLPromptStylerBatch:
+    # Styles lists of prompts with lists of styles in a single execution instead of one
+    # execution per pair. Styles come one per line or as a list from an upstream node.
+    INPUT_IS_LIST = True
 
     def __init__(self):
         pass
 
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_focus.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
+    def INPUT_TYPES(cls):
         return {
             "required": {
+                "category": ([category for category, _, _, _, _ in STYLE_CATEGORIES], {"default": "all"}),
                 "text_positive": ("STRING", {"default": "", "multiline": True}),
                 "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
+                "styles": ("STRING", {"default": "", "multiline": True}),
                 "log_prompt": (["No", "Yes"], {"default":"No"}),
             },
         }
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
+    RETURN_TYPES = ('STRING','STRING','STRING',)
+    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g','style',)
+    OUTPUT_IS_LIST = (True, True, True,)
     FUNCTION = 'prompt_styler'
     CATEGORY = 'Style Prompts'
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyTheme:
-
-    def __init__(self):
-        pass
-
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_themes.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
+    def IS_CHANGED(cls, **kwargs):
+        return categories_fingerprint(kwargs)
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
+    def prompt_styler(self, category, text_positive, text_negative, styles, log_prompt):
+        style_names = [line.strip() for text in styles for line in text.splitlines() if line.strip()]
+        positive_prompts, negative_prompts, style_names = style_prompt_batch(
+            load_category_catalog(category[0]), style_names, text_positive, text_negative)
 
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
+        if log_prompt[0] == "Yes":
+            for style, positive_prompt, negative_prompt in zip(style_names, positive_prompts, negative_prompts):
+                print(f"style: {style}")
+                print(f"positive_prompt: {positive_prompt}")
+                print(f"negative_prompt: {negative_prompt}")
 
-        return positive_prompt, negative_prompt
+        return positive_prompts, negative_prompts, style_names
 
-class SDXLPromptStylerbyEnvironment:
+class SDXLPromptStylerGrid:
+    # One chunk of the prompts x styles grid per execution. Feed next_index back into
+    # start_index to continue a sweep, or to resume one after a restart.
+    INPUT_IS_LIST = True
+    GRID_AXES = 3
 
     def __init__(self):
         pass
 
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_environment.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
+    def INPUT_TYPES(cls):
+        categories = [category for category, _, _, _, _ in STYLE_CATEGORIES]
+        input_types = {
             "required": {
                 "text_positive": ("STRING", {"default": "", "multiline": True}),
                 "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
+                "start_index": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "chunk_size": ("INT", {"default": 16, "min": 1, "max": 4096}),
                 "log_prompt": (["No", "Yes"], {"default":"No"}),
             },
+            "optional": {},
         }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
+        # One style per line, * for every style of the category, ? followed by a text query
+        # (? fog OR mist) for the styles whose templates match it, or # followed by a tag query
+        # (# portrait AND NOT monochrome) for the styles whose tags match. Empty axes are skipped.
+        for axis in range(1, cls.GRID_AXES + 1):
+            input_types["optional"][f"axis_{axis}_category"] = (categories, {"default": "all"})
+            input_types["optional"][f"axis_{axis}_styles"] = ("STRING", {"default": "", "multiline": True})
+        return input_types
+
+    RETURN_TYPES = ('STRING','STRING','STRING','INT','INT',)
+    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g','style','next_index','total',)
+    OUTPUT_IS_LIST = (True, True, True, False, False,)
     FUNCTION = 'prompt_styler'
     CATEGORY = 'Style Prompts'
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyMood:
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return categories_fingerprint(kwargs)
+
+    def prompt_styler(self, text_positive, text_negative, start_index, chunk_size, log_prompt, **axis_inputs):
+        if len(text_negative) <= 1:
+            text_negative = list(text_negative or [""]) * len(text_positive)
+        elif len(text_negative) != len(text_positive):
+            # Same rule as style_prompt_batch, zip would drop the unpaired prompts
+            print(f"An error occurred: Got {len(text_negative)} negative prompts for {len(text_positive)} positive prompts.")
+            return [], [], [], start_index[0], 0
+        prompts = list(zip(text_positive, text_negative))
+
+        axes = []
+        for axis in range(1, self.GRID_AXES + 1):
+            category = axis_inputs.get(f"axis_{axis}_category", ["all"])[0]
+            lines = [line.strip() for text in axis_inputs.get(f"axis_{axis}_styles", []) for line in text.splitlines()]
+            lines = [line for line in lines if line]
+            if not lines:
+                continue
+            catalog = load_category_catalog(category)
+            if lines == ["*"]:
+                lines = catalog.selectable_names
+            elif len(lines) == 1 and lines[0].startswith("?"):
+                lines = search_style_text(category, lines[0][1:])
+            elif len(lines) == 1 and lines[0].startswith("#"):
+                lines = search_style_tags(category, lines[0][1:])
+            axes.append((catalog, lines))
+
+        start_index = start_index[0]
+        total = style_grid_size(axes, prompts)
+        positive_prompts, negative_prompts, style_names = [], [], []
+        try:
+            cells = itertools.islice(iter_style_grid(axes, prompts, start_index), chunk_size[0])
+            for position, positive_prompt, negative_prompt, names in cells:
+                positive_prompts.append(positive_prompt)
+                negative_prompts.append(negative_prompt)
+                style_names.append(" | ".join(names))
+                if log_prompt[0] == "Yes":
+                    print(f"[{position}/{total}] style: {style_names[-1]}")
+                    print(f"positive_prompt: {positive_prompt}")
+                    print(f"negative_prompt: {negative_prompt}")
+        except Exception as e:
+            print(f"An error occurred: {str(e)}")
+
+        next_index = min(start_index + len(positive_prompts), total)
+        return positive_prompts, negative_prompts, style_names, next_index, total
+
+class SDXLPromptStylerStack:
+    # Applies several styles from any categories in one render. Slot 1 is applied first and
+    # each later slot wraps the result, the same as chaining the category nodes.
+    STACK_SLOTS = 5
 
     def __init__(self):
         pass
 
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_mood.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
+    def INPUT_TYPES(cls):
+        categories = [category for category, _, _, _, _ in STYLE_CATEGORIES]
+        input_types = {
             "required": {
                 "text_positive": ("STRING", {"default": "", "multiline": True}),
                 "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
                 "log_prompt": (["No", "Yes"], {"default":"No"}),
             },
+            "optional": {},
         }
+        # Slots with an empty style are skipped
+        for slot in range(1, cls.STACK_SLOTS + 1):
+            input_types["optional"][f"slot_{slot}_category"] = (categories, {"default": "all"})
+            input_types["optional"][f"slot_{slot}_style"] = ("STRING", {"default": ""})
+        return input_types
 
     RETURN_TYPES = ('STRING','STRING',)
     RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
     FUNCTION = 'prompt_styler'
     CATEGORY = 'Style Prompts'
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        return categories_fingerprint(kwargs)
+
+    def prompt_styler(self, text_positive, text_negative, log_prompt, **slot_inputs):
+        try:
+            styles = []
+            versions = []
+            for slot in range(1, self.STACK_SLOTS + 1):
+                template_name = slot_inputs.get(f"slot_{slot}_style", "")
+                if template_name:
+                    catalog = load_category_catalog(slot_inputs.get(f"slot_{slot}_category", "all"))
+                    styles.extend(resolve_styles(catalog, [template_name]))
+                    versions.append((catalog.version, template_name))
+
+            if styles:
+                style = compose_styles(tuple(styles))
+                positive_prompt, negative_prompt = render_cache.render(style, text_positive, text_negative, tuple(versions))
+            else:
+                positive_prompt, negative_prompt = text_positive, text_negative
+        except Exception as e:
+            print(f"An error occurred: {str(e)}")
+            return None
 
         if log_prompt == "Yes":
-            print(f"style: {style}")
+            print(f"style: {' + '.join(style.name for style in styles)}")
             print(f"text_positive: {text_positive}")
             print(f"text_negative: {text_negative}")
             print(f"positive_prompt: {positive_prompt}")
@@ -424,28 +2493,25 @@ class SDXLPromptStylerbyMood:
 
         return positive_prompt, negative_prompt
 
-class SDXLPromptStylerbySubject:
+NODE_CLASS_MAPPINGS = {}
+NODE_DISPLAY_NAME_MAPPINGS = {}
+
+class SDXLPromptStylerSelector:
+    # One node for every category. The style is a plain string checked against the chosen
+    # category's catalog, so the node spec carries no style list; the web extension fills a
+    # picker for the active category from /sdxl_prompt_styler/styles.
 
     def __init__(self):
         pass
 
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_subject.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
+    def INPUT_TYPES(cls):
         return {
             "required": {
                 "text_positive": ("STRING", {"default": "", "multiline": True}),
                 "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
+                "category": ([category for category, _, _, _, _ in STYLE_CATEGORIES], {"default": "all"}),
+                "style": ("STRING", {"default": ""}),
                 "log_prompt": (["No", "Yes"], {"default":"No"}),
             },
         }
@@ -455,53 +2521,27 @@ class SDXLPromptStylerbySubject:
     FUNCTION = 'prompt_styler'
     CATEGORY = 'Style Prompts'
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyTimeofDay:
-
-    def __init__(self):
-        pass
-
     @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_tod.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
+    def VALIDATE_INPUTS(cls, category=None, style=None):
+        # Linked inputs arrive as None and are checked when the node runs
+        if category is None or style is None:
+            return True
+        catalog = load_category_catalog(category)
+        if catalog is None:
+            return f"Unknown style category '{category}'."
+        if catalog.has_style(style):
+            return True
+        return f"Style '{style}' is not in the {category} styles."
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
+    @classmethod
+    def IS_CHANGED(cls, category="all", **kwargs):
+        return catalog_fingerprint(load_category_catalog(category), dict(kwargs, category=category))
 
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
+    def prompt_styler(self, text_positive, text_negative, category, style, log_prompt):
+        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(load_category_catalog(category), style, text_positive, text_negative)
 
         if log_prompt == "Yes":
+            print(f"category: {category}")
             print(f"style: {style}")
             print(f"text_positive: {text_positive}")
             print(f"text_negative: {text_negative}")
@@ -510,1249 +2550,138 @@ class SDXLPromptStylerbyTimeofDay:
 
         return positive_prompt, negative_prompt
 
-class SDXLPromptStylerbyCamera:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_camera.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
+for category, _, class_name, display_name, _ in STYLE_CATEGORIES:
+    globals()[class_name] = NODE_CLASS_MAPPINGS[class_name] = make_styler_node(category, class_name)
+    NODE_DISPLAY_NAME_MAPPINGS[class_name] = display_name
+
+NODE_CLASS_MAPPINGS["SDXLPromptStylerBatch"] = SDXLPromptStylerBatch
+NODE_DISPLAY_NAME_MAPPINGS["SDXLPromptStylerBatch"] = "Prompt Styler Batch"
+NODE_CLASS_MAPPINGS["SDXLPromptStylerGrid"] = SDXLPromptStylerGrid
+NODE_DISPLAY_NAME_MAPPINGS["SDXLPromptStylerGrid"] = "Prompt Styler Grid"
+NODE_CLASS_MAPPINGS["SDXLPromptStylerStack"] = SDXLPromptStylerStack
+NODE_DISPLAY_NAME_MAPPINGS["SDXLPromptStylerStack"] = "Prompt Styler Stack"
+NODE_CLASS_MAPPINGS["SDXLPromptStylerSelector"] = SDXLPromptStylerSelector
+NODE_DISPLAY_NAME_MAPPINGS["SDXLPromptStylerSelector"] = "Prompt Styler Selector"
+
+# HTTP routes, served by ComfyUI's PromptServer when the node pack is loaded there
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+def _query_int(request, key, default, low, high):
+    try:
+        return min(max(int(request.query.get(key, default)), low), high)
+    except ValueError:
+        return default
+
+def _catalog_etag(catalog):
+    return f'"{catalog.version}"'
+
+def _not_modified(request, etag):
+    # If-None-Match holds one or more ETags, possibly weak, or *
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+def _versioned_response(request, catalog, build_body):
+    # Every response carries the catalog version as its ETag, and a client that already has
+    # that version gets 304 without the body being built
+    etag = _catalog_etag(catalog)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _not_modified(request, etag):
+        return web.Response(status=304, headers=headers)
+    try:
+        body = build_body()
+    except ValueError as e:
+        return web.json_response({"error": str(e)}, status=400)
+    body["version"] = catalog.version
+    return web.json_response(body, headers=headers)
+
+def _route_catalog(category):
+    if category != "all" and category not in CATEGORY_FILES:
+        return None, web.json_response({"error": f"Unknown category: {category}"}, status=404)
+    catalog = load_category_catalog(category)
+    if catalog is None:
+        return None, web.json_response({"error": f"Styles of {category} could not be loaded"}, status=404)
+    return catalog, None
+
+async def search_styles_route(request):
+    # GET /sdxl_prompt_styler/search?q=van+gogh&category=all&limit=20
+    category = request.query.get("category", "all")
+    query = request.query.get("q", "")
+    limit = _query_int(request, "limit", 20, 1, 200)
+    catalog, error = _route_catalog(category)
+    if error is not None:
+        return error
+
+    def build_body():
+        results = search_style_names(catalog, query, limit)
         return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
+            "category": category,
+            "query": query,
+            "results": [{"name": name, "score": score} for name, score in results],
         }
 
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
+    return _versioned_response(request, catalog, build_body)
+
+async def list_styles_route(request):
+    # GET /sdxl_prompt_styler/styles?category=all&offset=0&limit=100&q=&text=&tags=
+    category = request.query.get("category", "all")
+    offset = _query_int(request, "offset", 0, 0, 1 << 31)
+    limit = _query_int(request, "limit", 100, 1, 1000)
+    query = request.query.get("q", "").strip()
+    text = request.query.get("text", "").strip()
+    tags = request.query.get("tags", "").strip()
+    catalog, error = _route_catalog(category)
+    if error is not None:
+        return error
+
+    def build_body():
+        total, names = list_style_names(catalog, offset, limit, query, text, tags)
+        return {
+            "category": category,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "styles": names,
+        }
 
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyComposition:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_composition.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyLighting:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_lighting.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyDepth:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_depth.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyFilter:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_filter.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyOriginal:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_original.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyMileHigh:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_mh.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-        
-class SDXLPromptStylerbyFantasySetting:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_fs.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyMythicalCreature:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_mc.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbySurrealism:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_surrealism.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-
-class SDXLPromptStylerbyImpressionism:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_impressionism.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyCyberpunkSurrealism:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_cs.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyQuantumRealism:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_qr.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbySteamPunkRealism:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_sr.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptStylerbyWyvern:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_wyvern.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-        
-class SDXLPromptStylerbyWyvern:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_wyvern.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyGothicRevival:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_gothrev.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyCelticArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_celticart.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyIrishFolkArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_irishfolkart.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbySportsArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_sports.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyFashionArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_fashion.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyWildlifeArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_wildlife.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyStreetArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_street.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyVikingArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_viking.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyRomanticNationalismArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_romanticnat.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyContemporaryNordicArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        # Get current file's directory
-        p = os.path.dirname(os.path.realpath(__file__))
-        # Construct 'sdxl_styles.json' path
-        file_path = os.path.join(p, 'sdxl_styles_contempnordic.json')
-
-        # Read JSON from file
-        self.json_data = read_json_file(file_path)
-        # Retrieve styles from JSON data
-        styles = read_sdxl_styles(self.json_data)
-        
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-        }
-
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt):
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt
-
-class SDXLPromptbyIcelandicContemporaryArt:
-
-    def __init__(self):
-        pass
-
-    @classmethod
-    def INPUT_TYPES(self):
-        p = os.path.dirname(os.path.realpath(__file))
-        file_path = os.path.join(p, 'sdxl_styles_all.json')
-        self.json_data = read_json_file(file_path)
-        styles = read_sdxl_styles(self.json_data)
-
-        return {
-            "required": {
-                "text_positive": ("STRING", {"default": "", "multiline": True}),
-                "text_negative": ("STRING", {"default": "", "multiline": True}),
-                "style": ((styles), ),
-                "log_prompt": (["No", "Yes"], {"default":"No"}),
-            },
-            "optional": {
-                "random_style": ("BOOLEAN", {"default": False}),  # Add a boolean parameter for random style selection
-            }
-        }
-    
-    RETURN_TYPES = ('STRING','STRING',)
-    RETURN_NAMES = ('positive_prompt_text_g','negative_prompt_text_g',)
-    FUNCTION = 'prompt_styler'
-    CATEGORY = 'Style Prompts'
-
-    def prompt_styler(self, text_positive, text_negative, style, log_prompt, random_style=False):
-        if random_style:
-            style = random.choice([template['name'] for template in self.json_data])
-        else:
-            style = text_positive  # You can change this to the appropriate parameter
-
-        positive_prompt, negative_prompt = read_sdxl_templates_replace_and_combine(self.json_data, style, text_positive, text_negative)
-
-        if log_prompt == "Yes":
-            print(f"style: {style}")
-            print(f"text_positive: {text_positive}")
-            print(f"text_negative: {text_negative}")
-            print(f"positive_prompt: {positive_prompt}")
-            print(f"negative_prompt: {negative_prompt}")
-
-        return positive_prompt, negative_prompt, style
-
-
-
-NODE_CLASS_MAPPINGS = {
-    "SDXLPromptStylerAll": SDXLPromptStylerAll,
-    "SDXLPromptStylerbyArtist": SDXLPromptStylerbyArtist,
-    "SDXLPromptStylerbyCamera": SDXLPromptStylerbyCamera,
-    "SDXLPromptbyCelticArt": SDXLPromptbyCelticArt,
-    "SDXLPromptStylerbyComposition": SDXLPromptStylerbyComposition,    
-    "SDXLPromptbyContemporaryNordicArt": SDXLPromptbyContemporaryNordicArt,
-    "SDXLPromptStylerbyCyberpunkSurrealism": SDXLPromptStylerbyCyberpunkSurrealism,
-    "SDXLPromptStylerbyDepth": SDXLPromptStylerbyDepth,
-    "SDXLPromptStylerbyEnvironment": SDXLPromptStylerbyEnvironment,
-    "SDXLPromptStylerbyFantasySetting": SDXLPromptStylerbyFantasySetting,    
-    "SDXLPromptbyFashionArt": SDXLPromptbyFashionArt,    
-    "SDXLPromptStylerbyFilter": SDXLPromptStylerbyFilter,
-    "SDXLPromptStylerbyFocus": SDXLPromptStylerbyFocus,
-    "SDXLPromptbyGothicRevival": SDXLPromptbyGothicRevival,
-    "SDXLPromptStylerHorror": SDXLPromptStylerHorror,
-    
-    
-    "SDXLPromptStylerbyImpressionism": SDXLPromptStylerbyImpressionism,
-    "SDXLPromptbyIrishFolkArt": SDXLPromptbyIrishFolkArt,
-    "SDXLPromptStylerbyLighting": SDXLPromptStylerbyLighting,
-    "SDXLPromptStylerbyMileHigh": SDXLPromptStylerbyMileHigh,
-    "SDXLPromptStylerMisc": SDXLPromptStylerMisc,
-    "SDXLPromptStylerbyMood": SDXLPromptStylerbyMood,
-    "SDXLPromptStylerbyMythicalCreature": SDXLPromptStylerbyMythicalCreature,    
-    "SDXLPromptStylerbyOriginal": SDXLPromptStylerbyOriginal,
-    "SDXLPromptStylerbyQuantumRealism": SDXLPromptStylerbyQuantumRealism,
-    "SDXLPromptbyRomanticNationalismArt": SDXLPromptbyRomanticNationalismArt,
-    "SDXLPromptbySportsArt": SDXLPromptbySportsArt,    
-    "SDXLPromptStylerbySteamPunkRealism": SDXLPromptStylerbySteamPunkRealism,    
-    "SDXLPromptbyStreetArt": SDXLPromptbyStreetArt,
-    "SDXLPromptStylerbySubject": SDXLPromptStylerbySubject,
-    "SDXLPromptStylerbySurrealism": SDXLPromptStylerbySurrealism,
-    "SDXLPromptStylerbyTheme": SDXLPromptStylerbyTheme,
-    "SDXLPromptStylerbyTimeofDay": SDXLPromptStylerbyTimeofDay,
-    "SDXLPromptbyVikingArt": SDXLPromptbyVikingArt,
-    "SDXLPromptbyWildlifeArt": SDXLPromptbyWildlifeArt,    
-    "SDXLPromptStylerbyWyvern": SDXLPromptStylerbyWyvern,
-}
-
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "SDXLPromptStylerAll": "Prompt Styler All",
-    "SDXLPromptStylerbyArtist": "Prompt Styler Artist",
-    "SDXLPromptStylerbyCamera": "Prompt Styler Camera",
-    "SDXLPromptbyCelticArt": "Prompt Styler Celtic Art",
-    "SDXLPromptStylerbyComposition": "Prompt Styler Composition",    
-    "SDXLPromptbyContemporaryNordicArt": "Prompt Styler Contemporary Nordic Art",
-    "SDXLPromptStylerbyCyberpunkSurrealism": "Prompt Styler Cyberpunk Surrealism",
-    "SDXLPromptStylerbyDepth": "Prompt Styler Depth",
-    "SDXLPromptStylerbyEnvironment": "Prompt Styler Environment",
-    "SDXLPromptStylerbyFantasySetting": "Prompt Styler Fantasy-Setting",
-    "SDXLPromptbyFashionArt": "Prompt Styler Fashion",
-    "SDXLPromptStylerbyFilter": "Prompt Styler Filter",
-    "SDXLPromptStylerbyFocus": "Prompt Styler Focus",
-    "SDXLPromptbyGothicRevival": "Prompt Styler Gothic Revival",
-    "SDXLPromptStylerHorror": "Prompt Styler Horror",
-    
-    
-    "SDXLPromptStylerbyImpressionism": "Prompt Styler Impressionism",
-    "SDXLPromptbyIrishFolkArt": "Prompt Styler Irish Folk Art",
-    "SDXLPromptStylerbyLighting": "Prompt Styler Lighting",
-    "SDXLPromptStylerbyMileHigh": "Prompt Styler MileHigh",
-    "SDXLPromptStylerMisc": "Prompt Styler Misc",
-    "SDXLPromptStylerbyMood": "Prompt Styler Mood",
-    "SDXLPromptStylerbyMythicalCreature": "Prompt Styler Mythical Creature",    
-    "SDXLPromptStylerbyOriginal": "Prompt Styler Original",
-    "SDXLPromptStylerbyQuantumRealism": "Prompt Styler Quantum Realism",
-    "SDXLPromptbyRomanticNationalismArt": "Prompt Styler Romantic Nationalism",
-    "SDXLPromptbySportsArt": "Prompt Styler Sports",
-    "SDXLPromptStylerbySteamPunkRealism": "Prompt Styler SteamPunk Realism",    
-    "SDXLPromptbyStreetArt": "Prompt Styler Street",
-    "SDXLPromptStylerbySubject": "Prompt Styler Subject",
-    "SDXLPromptStylerbySurrealism": "Prompt Styler Surrealism",
-    "SDXLPromptStylerbyTheme": "Prompt Styler Theme",
-    "SDXLPromptStylerbyTimeofDay": "Prompt Styler Time of Day",    
-    "SDXLPromptbyVikingArt": "Prompt Styler Viking Art",
-    "SDXLPromptbyWildlifeArt": "Prompt Styler Wildlife",
-    "SDXLPromptStylerbyWyvern": "Prompt Styler Wyvern",
-}
+    return _versioned_response(request, catalog, build_body)
+
+def register_routes(routes):
+    # routes is an aiohttp RouteTableDef, PromptServer.instance.routes inside ComfyUI
+    routes.get("/sdxl_prompt_styler/search")(search_styles_route)
+    routes.get("/sdxl_prompt_styler/styles")(list_styles_route)
+
+def create_routes_app():
+    # Standalone aiohttp application serving the same routes, for tests and tools that run
+    # without ComfyUI, e.g. aiohttp.test_utils.TestClient(TestServer(create_routes_app()))
+    routes = web.RouteTableDef()
+    register_routes(routes)
+    app = web.Application()
+    app.add_routes(routes)
+    return app
+
+try:
+    from server import PromptServer
+except ImportError:
+    PromptServer = None
+
+if web is not None and getattr(PromptServer, "instance", None) is not None:
+    register_routes(PromptServer.instance.routes)
+
+if WATCH_CATALOGS:
+    catalog_watcher = CatalogWatcher().start()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--sqlite"]:
+        database_path = sys.argv[2] if len(sys.argv) > 2 else STYLE_DATABASE_PATH
+        count = import_styles_to_sqlite(database_path)
+        print(f"Imported {count} styles into {database_path}")
+    else:
+        payload = build_catalog_artifact()
+        print(f"Compiled {len(payload['names'])} style catalogs into {CATALOG_ARTIFACT_PATH} ({payload['content_hash'][:12]})")
@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# Keep the test run from touching the files next to the node: the artifact, the cycle cursors
+# and the library database go to a scratch directory, and no watcher thread is started.
+_scratch = tempfile.mkdtemp(prefix="sdxl_prompt_styler_tests_")
+os.environ["SDXL_PROMPT_STYLER_WATCH"] = "0"
+os.environ["SDXL_PROMPT_STYLER_CATALOG"] = os.path.join(_scratch, "sdxl_styles.catalog")
+os.environ["SDXL_PROMPT_STYLER_CYCLE_STATE"] = "0"
+os.environ["SDXL_PROMPT_STYLER_DATABASE"] = os.path.join(_scratch, "sdxl_styles.sqlite")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
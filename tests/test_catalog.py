@@ -0,0 +1,243 @@
+import glob
+import json
+import os
+import threading
+import tracemalloc
+
+import pytest
+
+import sdxl_prompt_styler as styler
+
+STYLE_FILES = styler.list_style_files()
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf8') as file:
+        json.dump(data, file)
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_iter_json_array_matches_json_load(tmp_path, chunk_size):
+    data = [
+        {"name": "brackets [in] {strings}", "prompt": "a, b ] c } {prompt}"},
+        {"name": "escapes \" \\ é 😀", "prompt": "line\nbreak {prompt}"},
+        {"name": "nested", "prompt": "{prompt}", "extra": [[1, 2], {"a": [None, True, 1.5e3]}]},
+        [], {}, "text", 42, None,
+    ]
+    path = write_json(tmp_path / "styles.json", data)
+    assert list(styler.iter_json_array(path, chunk_size)) == data
+
+
+@pytest.mark.parametrize("text", ["[]", "  [ ]  ", "\n[\n{\"name\": \"a\"}\n]\n"])
+def test_iter_json_array_whitespace(tmp_path, text):
+    path = tmp_path / "styles.json"
+    path.write_text(text, encoding='utf8')
+    assert list(styler.iter_json_array(str(path), 1)) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["{}", "[{\"name\": \"a\"}", "[1 2]", "[1,]"])
+def test_iter_json_array_rejects_malformed(tmp_path, text):
+    path = tmp_path / "styles.json"
+    path.write_text(text, encoding='utf8')
+    with pytest.raises(ValueError):
+        list(styler.iter_json_array(str(path), 4))
+
+
+@pytest.mark.parametrize("file_path", STYLE_FILES[:8])
+def test_iter_json_array_shipped_files(file_path):
+    with open(file_path, 'r', encoding='utf8', errors='ignore') as file:
+        expected = json.load(file)
+    assert list(styler.iter_json_array(file_path, 97)) == expected
+
+
+def test_stream_large_catalog_in_bounded_memory(tmp_path):
+    # A synthetic catalog of a few hundred MB streams with a peak that does not depend on
+    # the file size. SDXL_PROMPT_STYLER_TEST_CATALOG_MB changes the size.
+    size = int(os.environ.get("SDXL_PROMPT_STYLER_TEST_CATALOG_MB", "256")) << 20
+    path = tmp_path / "sdxl_styles_large.json"
+    padding = "x" * 300
+    count = 0
+    written = 0
+    with open(path, 'w', encoding='utf8') as file:
+        file.write('[')
+        while written < size:
+            entry = json.dumps({"name": f"style {count}", "prompt": f"{padding} {{prompt}} {padding}",
+                                "negative_prompt": padding})
+            file.write((',\n' if count else '') + entry)
+            written += len(entry) + 2
+            count += 1
+        file.write(']')
+
+    tracemalloc.start()
+    try:
+        seen = 0
+        for template in styler.iter_json_array(str(path)):
+            assert template["name"] == f"style {seen}"
+            seen += 1
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert seen == count
+    assert peak < 8 << 20
+
+
+def test_scan_style_names_matches_parser(tmp_path):
+    data = [
+        {"name": "a", "note": {"name": "nested"}},
+        {"tags": ["name"], "name": "b \"quoted\"", "more": [{"name": "deeper"}]},
+        {"prompt": "{prompt}"},
+        {"name": "c", "prompt": "\"name\": \"fake\""},
+    ]
+    path = write_json(tmp_path / "styles.json", data)
+    assert styler.scan_style_names(path) == ["a", "b \"quoted\"", "c"]
+    assert styler.scan_style_names(path) == styler.index_style_templates(data)[0]
+
+
+@pytest.mark.parametrize("file_path", STYLE_FILES)
+def test_lazy_names_match_loaded_names(file_path):
+    catalog = styler.StyleCatalog(file_path=file_path)
+    scanned = list(styler.scan_style_names(file_path))
+    assert scanned == styler.index_style_templates(styler.iter_json_array(file_path))[0]
+    assert catalog.load().names == scanned
+
+
+def test_concurrent_artifact_builds(tmp_path):
+    artifact_path = str(tmp_path / "sdxl_styles.catalog")
+    threads = [threading.Thread(target=styler.build_catalog_artifact, args=(artifact_path,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    payload = styler.read_catalog_artifact(artifact_path)
+    assert payload is not None
+    assert set(payload["names"]) == {os.path.basename(file_path) for file_path in STYLE_FILES}
+    assert glob.glob(str(tmp_path / "*.tmp")) == []
+
+
+def test_artifact_reads_templates_on_load(tmp_path, monkeypatch):
+    artifact_path = str(tmp_path / "sdxl_styles.catalog")
+    styler.build_catalog_artifact(artifact_path)
+    tracemalloc.start()
+    try:
+        payload = styler.read_catalog_artifact(artifact_path)
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Only the header stays in memory, which is about the size of the names
+    assert retained < 2 << 20
+    monkeypatch.setattr(styler, "_catalog_artifact", payload)
+    for file_path in STYLE_FILES[:6]:
+        names, index = styler.read_packed_catalog(file_path)
+        cold = styler.StyleCatalog(file_path=file_path).load()
+        assert names == cold.names and list(index) == list(cold.index)
+        for name, style in index.items():
+            assert style.render("a cat", "ugly") == cold.get(name).render("a cat", "ugly")
+
+
+def test_malformed_source_keeps_artifact_current(tmp_path):
+    write_json(tmp_path / "sdxl_styles_good.json", [{"name": "a", "prompt": "a {prompt}"}])
+    (tmp_path / "sdxl_styles_bad.json").write_text("[{\"name\": ", encoding='utf8')
+    artifact_path = str(tmp_path / "sdxl_styles.catalog")
+    styler.build_catalog_artifact(artifact_path, str(tmp_path))
+    payload = styler.read_catalog_artifact(artifact_path)
+    assert set(payload["sources"]) == {"sdxl_styles_good.json", "sdxl_styles_bad.json"}
+    assert set(payload["names"]) == {"sdxl_styles_good.json"}
+    assert styler._artifact_is_current(payload, str(tmp_path))
+    (tmp_path / "sdxl_styles_bad.json").write_text("[]", encoding='utf8')
+    assert not styler._artifact_is_current(payload, str(tmp_path))
+
+
+def test_missing_artifact_builds_in_background(tmp_path, monkeypatch):
+    artifact_path = str(tmp_path / "sdxl_styles.catalog")
+    monkeypatch.setattr(styler, "CATALOG_ARTIFACT_PATH", artifact_path)
+    monkeypatch.setattr(styler, "_catalog_artifact", None)
+    monkeypatch.setattr(styler, "_catalog_artifact_build", None)
+    build = threading.Event()
+    original_build = styler.build_catalog_artifact
+
+    def wait_then_build():
+        build.wait()
+        return original_build()
+
+    monkeypatch.setattr(styler, "build_catalog_artifact", wait_then_build)
+    # Names come from the JSON while the build has not finished
+    assert styler.read_packed_names(STYLE_FILES[0]) is None
+    assert styler.load_style_catalog(STYLE_FILES[0]).names == styler.scan_style_names(STYLE_FILES[0])
+    build.set()
+    styler._catalog_artifact_build.join()
+    assert styler.read_packed_names(STYLE_FILES[0]) == styler.scan_style_names(STYLE_FILES[0])
+    assert os.path.exists(artifact_path)
+
+
+def test_unwritable_folder_skips_build(tmp_path, monkeypatch):
+    monkeypatch.setattr(styler, "CATALOG_ARTIFACT_PATH", str(tmp_path / "missing" / "sdxl_styles.catalog"))
+    monkeypatch.setattr(styler, "_catalog_artifact", None)
+    monkeypatch.setattr(styler, "_catalog_artifact_build", None)
+    assert styler.read_packed_names(STYLE_FILES[0]) is None
+    assert styler._catalog_artifact_build is None
+
+
+def test_all_catalog_follows_registry():
+    ordered = sorted((row for row in styler.STYLE_CATEGORIES if row[4] is not None), key=lambda row: row[4])
+    assert styler.ALL_CATALOG_FILES == tuple(row[1] for row in ordered)
+    assert len(set(styler.ALL_CATALOG_FILES)) == len(styler.ALL_CATALOG_FILES)
+    catalog = styler.load_all_catalog()
+    assert [os.path.basename(member.file_path) for member in catalog.catalogs] == list(styler.ALL_CATALOG_FILES)
+
+
+def test_all_catalog_resolves_to_first_member():
+    catalog = styler.load_all_catalog()
+    for name, style in catalog.index.items():
+        owner = next(member for member in catalog.catalogs if name in member.index)
+        assert owner.index[name] is style
+
+
+def test_union_tags_come_from_owning_member():
+    catalog = styler.load_all_catalog()
+    tags = catalog.tag_index().tags
+    for member in catalog.catalogs:
+        member_tags = member.tag_index().tags
+        for name in member.selectable_names:
+            if catalog.index[name] is member.index[name]:
+                assert tags[name] == member_tags[name]
+    assert "milehigh" not in tags["Frida Kahlo"]
+
+
+def test_version_tracks_content_not_mtime(tmp_path):
+    path = write_json(tmp_path / "sdxl_styles_test.json", [{"name": "a", "prompt": "a {prompt}"}])
+    version = styler.load_style_catalog(path).version
+    os.utime(path, ns=(1, 1))
+    assert styler.load_style_catalog(path).version == version
+    write_json(path, [{"name": "a", "prompt": "b {prompt}"}])
+    assert styler.load_style_catalog(path).version != version
+
+
+def test_hot_reload_matches_cold_load(tmp_path):
+    with open(styler.list_style_files()[5], 'r', encoding='utf8', errors='ignore') as file:
+        templates = json.load(file)[:60]
+    path = write_json(tmp_path / "sdxl_styles_reload.json", templates)
+    catalog = styler.load_style_catalog(path).load()
+    stats = styler.get_catalog_cache_stats()
+
+    edited = [dict(template) for template in templates]
+    edited[3]["prompt"] = "edited {prompt}"
+    del edited[10:15]
+    edited.insert(20, {"name": "added style", "prompt": "added {prompt}", "negative_prompt": "added negative"})
+    edited.append({"name": edited[0]["name"], "prompt": "duplicate {prompt}"})
+    edited.append({"name": "no prompt"})
+    write_json(path, edited)
+    os.utime(path, ns=(1, 1))
+    styler.refresh_style_catalogs(str(tmp_path))
+
+    reloaded = styler.load_style_catalog(path)
+    assert reloaded is not catalog and reloaded.loaded
+    assert styler.get_catalog_cache_stats()["reloads"] == stats["reloads"] + 1
+    cold = styler.StyleCatalog(file_path=path).load()
+    assert reloaded.names == cold.names
+    assert list(reloaded.selectable_names) == list(cold.selectable_names)
+    for name in cold.selectable_names:
+        assert reloaded.get(name).render("a cat", "ugly") == cold.get(name).render("a cat", "ugly")
+    # Styles whose text did not change keep their compiled objects
+    assert reloaded.get(edited[0]["name"]) is catalog.get(edited[0]["name"])
+    assert reloaded.get(edited[3]["name"]) is not catalog.get(edited[3]["name"])
@@ -0,0 +1,195 @@
+import collections
+import gc
+import json
+import random
+import tracemalloc
+
+import pytest
+
+import sdxl_prompt_styler as styler
+
+AllNode = styler.NODE_CLASS_MAPPINGS["SDXLPromptStylerAll"]
+ArtistNode = styler.NODE_CLASS_MAPPINGS["SDXLPromptStylerbyArtist"]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 17, 255, 256, 257, 1000, 5492])
+def test_style_permutation_is_a_bijection(size):
+    for seed, cycle in [(0, 0), (1, 0), (1, 1), (2 ** 64 - 1, 7)]:
+        permutation = styler.StylePermutation(size, (seed, cycle))
+        assert sorted(permutation[position] for position in range(size)) == list(range(size))
+
+
+def test_style_permutation_depends_on_key():
+    orders = {tuple(styler.StylePermutation(100, (seed, 0))[i] for i in range(100)) for seed in range(10)}
+    assert len(orders) == 10
+
+
+def test_cycle_visits_every_style_once_per_cycle():
+    cycle = styler.StyleCycle()
+    pool = [f"style {i}" for i in range(37)]
+    for _ in range(3):
+        assert sorted(cycle.draw("key", 5, pool) for _ in pool) == sorted(pool)
+
+
+def test_cycle_survives_changing_seeds():
+    # A seed widget set to randomize gives every queue item a new seed
+    cycle = styler.StyleCycle()
+    pool = [f"style {i}" for i in range(29)]
+    seeds = iter(range(1000, 2000))
+    for _ in range(3):
+        assert sorted(cycle.draw("key", next(seeds), pool) for _ in pool) == sorted(pool)
+
+
+def test_cycle_state_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(styler.StyleCycle, "MAX_CYCLES", 8)
+    path = str(tmp_path / "cycles.json")
+    cycle = styler.StyleCycle(path)
+    for i in range(20):
+        cycle.draw(f"key {i}", i, ["a", "b"])
+        cycle.draw("kept", i, ["a", "b"])
+    with open(path, 'r', encoding='utf8') as file:
+        cursors = json.load(file)
+    assert len(cursors) == 8 and "kept" in cursors and "key 0" not in cursors
+
+
+def test_node_cycle_key_ignores_seed():
+    node = styler.NODE_CLASS_MAPPINGS["SDXLPromptStylerbyMood"]()
+    catalog = styler.load_category_catalog("mood")
+    key = node.cycle_key("uniform", "")
+    styler.style_cycle.reset(key)
+    drawn = [node.select_style(catalog, seed, selection_mode="cycle") for seed in range(len(catalog.selectable_names))]
+    assert sorted(drawn) == sorted(catalog.selectable_names)
+
+
+def test_alias_table_follows_weights():
+    table = styler.AliasTable(["a", "b", "c", "d"], [1.0, 2.0, 0.0, 5.0])
+    rng = random.Random(3)
+    counts = collections.Counter(table.sample(rng) for _ in range(80000))
+    assert counts["c"] == 0
+    for name, weight in [("a", 1), ("b", 2), ("d", 5)]:
+        assert abs(counts[name] / 80000 - weight / 8) < 0.01
+
+
+def test_seeded_selection_is_deterministic():
+    node = AllNode()
+    first = node.prompt_styler("cat", "", "none byArtists", "No", auto_select_style=True, seed=42)
+    assert node.prompt_styler("cat", "", "none byArtists", "No", auto_select_style=True, seed=42) == first
+
+
+def test_all_node_keeps_saved_widget_order():
+    optional = list(AllNode.INPUT_TYPES()["optional"])
+    assert optional[:2] == ["auto_select_style", "auto_refresh"]
+
+
+WEIGHTINGS = ["uniform", "by category", "weights file"]
+
+
+@pytest.fixture
+def weights_file(tmp_path):
+    path = tmp_path / "weights.json"
+    path.write_text(json.dumps({"Raven": 5, "A.J.Casson": 0}), encoding='utf8')
+    return str(path)
+
+
+@pytest.mark.parametrize("filters", [{"style_filter": "zzzqqq"}, {"style_filter": "(fog"}, {"tag_filter": "nosuchtag"}])
+@pytest.mark.parametrize("selection_mode", ["random", "cycle"])
+@pytest.mark.parametrize("weighting", WEIGHTINGS)
+def test_filters_matching_nothing_keep_the_style(filters, selection_mode, weighting, weights_file):
+    expected = ArtistNode().prompt_styler("cat", "", "A.J.Casson", "No")
+    result = AllNode().prompt_styler("cat", "", "A.J.Casson", "No", auto_select_style=True, seed=1, weighting=weighting,
+                                     weights_file=weights_file, selection_mode=selection_mode, **filters)
+    assert result == expected
+
+
+@pytest.mark.parametrize("selection_mode", ["random", "cycle"])
+@pytest.mark.parametrize("weighting", WEIGHTINGS)
+def test_filtered_selection_matches_filter(selection_mode, weighting, weights_file):
+    catalog = styler.load_all_catalog()
+    matching = set(catalog.text_index().search("fog OR mist"))
+    node = AllNode()
+    for seed in range(20):
+        assert node.select_style(catalog, seed, weighting, weights_file, selection_mode, "fog OR mist") in matching
+
+
+def test_filter_with_zero_weights_stays_in_filter(tmp_path):
+    # The fallback for all-zero weights is uniform over the matched styles only
+    catalog = styler.load_all_catalog()
+    matching = catalog.text_index().search("fog OR mist")
+    path = tmp_path / "weights.json"
+    path.write_text(json.dumps({name: 0 for name in matching}), encoding='utf8')
+    node = AllNode()
+    drawn = {node.select_style(catalog, seed, "weights file", str(path), style_filter="fog OR mist") for seed in range(50)}
+    assert drawn <= set(matching) and len(drawn) > 1
+
+
+def test_validate_inputs_rejects_malformed_filters():
+    assert AllNode.VALIDATE_INPUTS(style="A.J.Casson", auto_select_style=True, style_filter="fog OR mist") is True
+    assert "style_filter" in AllNode.VALIDATE_INPUTS(style="A.J.Casson", auto_select_style=True, style_filter="(fog")
+    assert "tag_filter" in AllNode.VALIDATE_INPUTS(style="A.J.Casson", auto_select_style=True, tag_filter="portrait AND")
+    assert "not in" in AllNode.VALIDATE_INPUTS(style="no such style")
+
+
+def test_input_types_reuses_the_spec():
+    # Once built, a spec costs no allocations per call until the catalog is reloaded
+    first = ArtistNode.INPUT_TYPES()
+    assert ArtistNode.INPUT_TYPES() is first
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(1000):
+            ArtistNode.INPUT_TYPES()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    module_filter = [tracemalloc.Filter(True, styler.__file__)]
+    growth = after.filter_traces(module_filter).compare_to(before.filter_traces(module_filter), 'filename')
+    assert sum(stat.count_diff for stat in growth) < 10
+    assert first["required"]["style"][1]["catalog_version"] == styler.load_category_catalog("artist").version
+
+
+def test_is_changed_is_stable():
+    inputs = {"text_positive": "cat", "style": "A.J.Casson", "auto_select_style": False}
+    assert ArtistNode.IS_CHANGED(**inputs) == ArtistNode.IS_CHANGED(**inputs)
+    assert ArtistNode.IS_CHANGED(**inputs) != ArtistNode.IS_CHANGED(**dict(inputs, text_positive="dog"))
+    cycle = dict(inputs, auto_select_style=True, selection_mode="cycle")
+    assert AllNode.IS_CHANGED(**cycle) != AllNode.IS_CHANGED(**cycle)
+
+
+def test_categories_fingerprint_covers_named_categories(monkeypatch):
+    inputs = {"category": ["camera"], "styles": ["x"]}
+    fingerprint = styler.categories_fingerprint(inputs)
+    assert styler.categories_fingerprint(inputs) == fingerprint
+    catalog = styler.load_category_catalog("camera")
+    monkeypatch.setattr(catalog, "_version", "changed")
+    assert styler.categories_fingerprint(inputs) != fingerprint
+
+
+def test_stack_matches_chained_nodes():
+    stack = styler.SDXLPromptStylerStack().prompt_styler(
+        "cat", "ugly", "No", slot_1_category="artist", slot_1_style="A.J.Casson",
+        slot_2_category="mood", slot_2_style=styler.load_category_catalog("mood").selectable_names[2])
+    positive, negative = ArtistNode().prompt_styler("cat", "ugly", "A.J.Casson", "No")
+    mood = styler.NODE_CLASS_MAPPINGS["SDXLPromptStylerbyMood"]()
+    assert stack == mood.prompt_styler(positive, negative, styler.load_category_catalog("mood").selectable_names[2], "No")
+
+
+def test_grid_pages_resume():
+    grid = styler.SDXLPromptStylerGrid()
+    inputs = {"text_positive": ["a", "b"], "text_negative": [""], "log_prompt": ["No"],
+              "axis_1_category": ["mood"], "axis_1_styles": ["*"]}
+    whole = grid.prompt_styler(start_index=[0], chunk_size=[4096], **inputs)
+    pages, start = [], 0
+    while start < whole[4]:
+        page = grid.prompt_styler(start_index=[start], chunk_size=[7], **inputs)
+        pages.extend(page[0])
+        start = page[3]
+    assert pages == whole[0]
+
+
+def test_grid_rejects_unpaired_negative_prompts(capsys):
+    grid = styler.SDXLPromptStylerGrid()
+    result = grid.prompt_styler(text_positive=["a", "b", "c"], text_negative=["x", "y"], start_index=[0], chunk_size=[16],
+                                log_prompt=["No"], axis_1_category=["mood"], axis_1_styles=["*"])
+    assert result == ([], [], [], 0, 0)
+    assert "2 negative prompts for 3 positive prompts" in capsys.readouterr().out
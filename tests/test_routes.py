@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+import sdxl_prompt_styler as styler
+
+test_utils = pytest.importorskip("aiohttp.test_utils")
+
+
+def fetch(*requests):
+    # Runs the requests against a standalone app, returning (status, headers, json or None)
+    async def run():
+        responses = []
+        async with test_utils.TestClient(test_utils.TestServer(styler.create_routes_app())) as client:
+            for path, headers in requests:
+                response = await client.get(path, headers=headers or {})
+                body = await response.json() if response.status != 304 else None
+                responses.append((response.status, response.headers, body))
+        return responses
+    return asyncio.run(run())
+
+
+def test_style_list_pages():
+    catalog = styler.load_category_catalog("camera")
+    (status, headers, body), = fetch(("/sdxl_prompt_styler/styles?category=camera&offset=5&limit=10", None))
+    assert status == 200
+    assert body["total"] == len(catalog.names)
+    assert body["styles"] == catalog.names[5:15]
+    assert body["version"] == catalog.version
+    assert headers["ETag"] == f'"{catalog.version}"'
+
+
+def test_style_list_queries():
+    catalog = styler.load_all_catalog()
+    (_, _, text), (_, _, tags), (_, _, fuzzy) = fetch(
+        ("/sdxl_prompt_styler/styles?text=fog%20OR%20mist&limit=1000", None),
+        ("/sdxl_prompt_styler/styles?tags=horror%20AND%20portrait&limit=1000", None),
+        ("/sdxl_prompt_styler/styles?q=van%20gogh&limit=3", None),
+    )
+    assert text["styles"] == catalog.text_index().search("fog OR mist")
+    assert tags["styles"] == catalog.tag_index().search("horror AND portrait")
+    assert fuzzy["styles"][0] == "Vincent Van Gogh"
+
+
+@pytest.mark.parametrize("path", ["/sdxl_prompt_styler/styles?category=camera", "/sdxl_prompt_styler/search?q=gogh"])
+def test_conditional_requests(path):
+    (status, headers, _), = fetch((path, None))
+    assert status == 200
+    etag = headers["ETag"]
+    responses = fetch((path, {"If-None-Match": etag}), (path, {"If-None-Match": f'"other", W/{etag}'}),
+                      (path, {"If-None-Match": "*"}), (path, {"If-None-Match": '"other"'}))
+    assert [response[0] for response in responses] == [304, 304, 304, 200]
+    assert responses[0][1]["ETag"] == etag
+
+
+def test_errors():
+    responses = fetch(
+        ("/sdxl_prompt_styler/styles?category=nope", None),
+        ("/sdxl_prompt_styler/search?category=nope&q=x", None),
+        ("/sdxl_prompt_styler/styles?text=(fog", None),
+        ("/sdxl_prompt_styler/styles?tags=AND", None),
+    )
+    assert [response[0] for response in responses] == [404, 404, 400, 400]
+    assert all("error" in response[2] for response in responses)
+
+
+def test_search_ranks_names():
+    (status, _, body), = fetch(("/sdxl_prompt_styler/search?q=van%20gog&category=artist&limit=5", None))
+    assert status == 200
+    assert body["results"][0]["name"] == "Vincent Van Gogh"
+    assert len(body["results"]) <= 5
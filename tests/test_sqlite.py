@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+
+import pytest
+
+import sdxl_prompt_styler as styler
+
+
+@pytest.fixture(scope="module")
+def library(tmp_path_factory):
+    database_path = str(tmp_path_factory.mktemp("library") / "sdxl_styles.sqlite")
+    styler.import_styles_to_sqlite(database_path)
+    return styler.load_style_catalog(database_path)
+
+
+def test_library_matches_all_catalog(library):
+    catalog = styler.load_all_catalog()
+    assert isinstance(library, styler.SQLiteStyleCatalog)
+    assert list(library.selectable_names) == list(catalog.selectable_names)
+    for name in catalog.selectable_names[::7]:
+        for negative_prompt in ["", "ugly"]:
+            assert library.get(name).render("a cat", negative_prompt) == catalog.get(name).render("a cat", negative_prompt)
+
+
+def test_library_tags_match_all_catalog(library):
+    assert library.tag_index().tag_counts() == styler.load_all_catalog().tag_index().tag_counts()
+
+
+def test_library_pages_without_loading_names(tmp_path):
+    database_path = str(tmp_path / "sdxl_styles.sqlite")
+    styler.import_styles_to_sqlite(database_path)
+    library = styler.load_style_catalog(database_path)
+    names = styler.load_all_catalog().selectable_names
+    assert styler.list_style_names(library, 100, 20) == (len(names), list(names[100:120]))
+    assert library.has_style(names[5]) and not library.has_style("no such style")
+    total, found = styler.list_style_names(library, 0, 5, "van gog")
+    assert found[0] == "Vincent Van Gogh" and total <= styler.MAX_RANKED_STYLES
+    assert styler.search_style_names(library, "portrait", 3)[0] == ("Portrait", 2.0)
+    assert library._names is None
+
+
+def test_library_version_comes_from_metadata(tmp_path, monkeypatch):
+    database_path = str(tmp_path / "sdxl_styles.sqlite")
+    styler.import_styles_to_sqlite(database_path)
+    library = styler.load_style_catalog(database_path)
+
+    def hash_whole_file(file_path):
+        raise AssertionError("the library file was hashed")
+
+    monkeypatch.setattr(styler, "file_content_hash", hash_whole_file)
+    version = library.version
+    assert len(version) == styler.CATALOG_VERSION_LENGTH
+    monkeypatch.undo()
+
+    # Same styles, same version; one changed prompt, a new version
+    source = styler.list_style_files()[0]
+    with open(source, 'r', encoding='utf8') as file:
+        templates = json.load(file)
+    templates[0]["prompt"] = "edited {prompt}"
+    (tmp_path / "edited").mkdir()
+    edited = str(tmp_path / "edited" / os.path.basename(source))
+    with open(edited, 'w', encoding='utf8') as file:
+        json.dump(templates, file)
+    versions = []
+    for index, file_path in enumerate([source, source, edited]):
+        path = str(tmp_path / f"library_{index}.sqlite")
+        styler.import_styles_to_sqlite(path, [file_path])
+        versions.append(styler.load_style_catalog(path).version)
+    assert versions[0] == versions[1] != versions[2]
+
+
+def test_library_text_queries(library):
+    assert library.text_index().search("fog OR mist") == styler.load_all_catalog().text_index().search("fog OR mist")
+    with pytest.raises(ValueError):
+        library.check_filters("(fog")
+    with pytest.raises(ValueError):
+        library.check_filters("", "portrait AND")
+
+
+def test_library_style_cache_is_thread_safe(library, monkeypatch):
+    monkeypatch.setattr(library, "MAX_COMPILED_STYLES", 50)
+    library._styles.clear()
+    names = list(library.name_page(0, 3000))
+    errors = []
+
+    def work(start):
+        try:
+            for name in names[start::8]:
+                assert library.get(name).name == name
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(start,)) for start in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(library._styles) <= 50
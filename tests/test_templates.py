@@ -0,0 +1,88 @@
+import itertools
+import json
+import random
+
+import pytest
+
+import sdxl_prompt_styler as styler
+
+TEMPLATES = ["", "{prompt}", "plain", "a {prompt} b", "{prompt}{prompt}", "x {prompt} y {prompt} z", "{prompt} end", "start {prompt}"]
+
+
+def legacy_render(templates, template_name, positive_prompt, negative_prompt):
+    # The str.replace rendering the node did before templates were compiled
+    for template in templates:
+        if 'name' not in template or 'prompt' not in template:
+            continue
+        if template['name'] == template_name:
+            prompt = template['prompt'].replace('{prompt}', positive_prompt)
+            positive_prompt = prompt if prompt else positive_prompt
+            template_negative = styler.template_negative_prompt(template)
+            if negative_prompt:
+                negative_prompt = template_negative.replace('{prompt}', negative_prompt) if template_negative else negative_prompt
+            else:
+                negative_prompt = template_negative
+            return positive_prompt, negative_prompt
+
+
+@pytest.mark.parametrize("outer, inner", list(itertools.product(TEMPLATES, TEMPLATES)))
+def test_compose_templates_matches_two_step_render(outer, inner):
+    outer_template = styler.compile_template(outer)
+    inner_template = styler.compile_template(inner)
+    composed = styler.compose_templates(outer_template, inner_template)
+    for text in ["", "cat", "{prompt}"]:
+        assert composed.render(text) == outer_template.render(inner_template.render(text))
+
+
+def test_compose_styles_matches_chained_nodes():
+    catalog = styler.load_all_catalog()
+    rng = random.Random(7)
+    names = list(catalog.selectable_names)
+    for _ in range(200):
+        styles = tuple(catalog.get(name) for name in rng.sample(names, rng.randint(1, 4)))
+        composed = styler.compose_styles(styles)
+        for negative_prompt in ["", "ugly"]:
+            positive, negative = "a cat", negative_prompt
+            for style in styles:
+                positive, negative = style.render(positive, negative)
+            assert composed.render("a cat", negative_prompt) == (positive, negative)
+
+
+@pytest.mark.parametrize("file_path", styler.list_style_files())
+def test_compiled_render_matches_replace(file_path):
+    catalog = styler.load_style_catalog(file_path)
+    with open(file_path, 'r', encoding='utf8', errors='ignore') as file:
+        templates = [template for template in json.load(file) if isinstance(template, dict)]
+    for name in catalog.selectable_names:
+        for negative_prompt in ["", "ugly"]:
+            expected = legacy_render(templates, name, "a cat", negative_prompt)
+            assert catalog.get(name).render("a cat", negative_prompt) == expected
+
+
+def test_render_cache_skips_raw_template_lists():
+    styler.render_cache.clear()
+    templates = [{"name": "a", "prompt": "a {prompt}", "negative_prompt": "n {prompt}"}]
+    for _ in range(3):
+        assert styler.read_sdxl_templates_replace_and_combine(templates, "a", "cat", "dog") == ("a cat", "n dog")
+    stats = styler.get_render_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (0, 0, 0)
+
+
+def test_render_cache_hits_catalog_styles():
+    styler.render_cache.clear()
+    catalog = styler.load_category_catalog("camera")
+    name = catalog.selectable_names[3]
+    first = styler.read_sdxl_templates_replace_and_combine(catalog, name, "cat", "dog")
+    assert styler.read_sdxl_templates_replace_and_combine(catalog, name, "cat", "dog") == first
+    stats = styler.get_render_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_batch_matches_single_renders():
+    catalog = styler.load_category_catalog("mood")
+    names = list(catalog.selectable_names[:5])
+    positives = ["a cat", "a dog", ""]
+    batch = styler.style_prompt_batch(catalog, names, positives, ["ugly"])
+    expected = [catalog.get(name).render(positive, "ugly") for positive in positives for name in names]
+    assert list(zip(batch[0], batch[1])) == expected
+    assert batch[2] == names * len(positives)
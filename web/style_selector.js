@@ -0,0 +1,154 @@
+import { app } from "../../scripts/app.js";
+import { api } from "../../scripts/api.js";
+
+// Fills the style picker of the Prompt Styler Selector node with the names of the active
+// category, fetched page by page from /sdxl_prompt_styler/styles the first time a category
+// is chosen. Picking a category again revalidates its list with one conditional request.
+// Nodes whose style input names a fixed category in style_list, such as Prompt Styler
+// Library, are too large to list whole; their picker shows the matches of a search box
+// instead, one request per search. The style input itself stays a plain string, so it can
+// also be typed or linked.
+
+const PAGE_SIZE = 1000;
+const SEARCH_LIMIT = 100;
+// Category -> { list: { version, names }, pending: promise of the names while a fetch runs }
+const styleLists = new Map();
+
+async function fetchStylePages(category, cached) {
+    let names = [];
+    let version = null;
+    for (let offset = 0; ; offset += PAGE_SIZE) {
+        const query = new URLSearchParams({ category, offset, limit: PAGE_SIZE });
+        // Only the first page is conditional, a 304 means the cached list is still current
+        const headers = offset === 0 && cached ? { "If-None-Match": `"${cached.version}"` } : {};
+        const response = await api.fetchApi(`/sdxl_prompt_styler/styles?${query}`, { headers });
+        if (response.status === 304) {
+            return cached;
+        }
+        if (!response.ok) {
+            throw new Error(`Style list for ${category} failed with HTTP ${response.status}`);
+        }
+        const page = await response.json();
+        // The styles changed between two pages, start over from the first page
+        if (version !== null && page.version !== version) {
+            names = [];
+            version = null;
+            cached = null;
+            offset = -PAGE_SIZE;
+            continue;
+        }
+        version = page.version;
+        names.push(...page.styles);
+        if (!page.styles.length || names.length >= page.total) {
+            return { version, names };
+        }
+    }
+}
+
+function fetchStyles(category) {
+    const entry = styleLists.get(category);
+    // Nodes refreshing the same category at once share one request
+    if (entry?.pending) {
+        return entry.pending;
+    }
+    const pending = fetchStylePages(category, entry?.list).then(
+        (list) => {
+            styleLists.set(category, { list });
+            return list.names;
+        },
+        (error) => {
+            // A failed request is retried the next time the category is picked
+            styleLists.set(category, { list: entry?.list });
+            throw error;
+        },
+    );
+    styleLists.set(category, { list: entry?.list, pending });
+    return pending;
+}
+
+async function searchStyles(category, search) {
+    // The best matches for the search text, or the first names of the list without one
+    const query = new URLSearchParams({ category, limit: SEARCH_LIMIT });
+    if (search) {
+        query.set("q", search);
+    }
+    const response = await api.fetchApi(`/sdxl_prompt_styler/styles?${query}`);
+    if (!response.ok) {
+        throw new Error(`Style search in ${category} failed with HTTP ${response.status}`);
+    }
+    return (await response.json()).styles;
+}
+
+app.registerExtension({
+    name: "SDXLPromptStyler.StyleSelector",
+
+    async beforeRegisterNodeDef(nodeType, nodeData) {
+        const styleList = nodeData.input?.required?.style?.[1]?.style_list;
+        if (nodeData.name !== "SDXLPromptStylerSelector" && !styleList) {
+            return;
+        }
+
+        const onNodeCreated = nodeType.prototype.onNodeCreated;
+        nodeType.prototype.onNodeCreated = function () {
+            const result = onNodeCreated?.apply(this, arguments);
+            const categoryWidget = styleList ? null : this.widgets?.find((widget) => widget.name === "category");
+            const styleWidget = this.widgets?.find((widget) => widget.name === "style");
+            if ((!styleList && !categoryWidget) || !styleWidget) {
+                return result;
+            }
+            const activeCategory = () => styleList ?? categoryWidget.value;
+
+            const searchWidget = styleList
+                ? this.addWidget("text", "search styles", "", () => refresh(), { serialize: false })
+                : null;
+            if (searchWidget) {
+                searchWidget.serialize = false;
+            }
+            const activeSearch = () => searchWidget?.value.trim() ?? "";
+
+            // The picker only edits the style string and is left out of the saved workflow
+            const picker = this.addWidget("combo", "pick style", styleWidget.value, (value) => {
+                styleWidget.value = value;
+                styleWidget.callback?.(value);
+            }, { values: [], serialize: false });
+            picker.serialize = false;
+
+            const refresh = async () => {
+                const category = activeCategory();
+                const search = activeSearch();
+                try {
+                    const names = searchWidget ? await searchStyles(category, search) : await fetchStyles(category);
+                    if (activeCategory() !== category || activeSearch() !== search) {
+                        return;
+                    }
+                    picker.options.values = names;
+                    // Search results rarely hold the chosen style, the picker keeps showing it
+                    picker.value = searchWidget || names.includes(styleWidget.value) ? styleWidget.value : (names[0] ?? "");
+                    this.setDirtyCanvas(true, true);
+                } catch (error) {
+                    console.error(error);
+                }
+            };
+
+            if (categoryWidget) {
+                const categoryCallback = categoryWidget.callback;
+                categoryWidget.callback = function () {
+                    const callbackResult = categoryCallback?.apply(this, arguments);
+                    refresh();
+                    return callbackResult;
+                };
+            }
+
+            // Workflows set the widget values after the node is created
+            const onConfigure = this.onConfigure;
+            this.onConfigure = function () {
+                const configureResult = onConfigure?.apply(this, arguments);
+                refresh();
+                return configureResult;
+            };
+
+            refresh();
+            return result;
+        };
+    },
+});